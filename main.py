@@ -13,7 +13,14 @@ from apscheduler.datastores.sqlalchemy import SQLAlchemyDataStore
 from redis import asyncio as aioredis
 
 from telegram_bot.resources.bot_buttons import BotButtons
-from telegram_bot.db.base import proceed_schemas, ENGINE, drop_all_tables
+from telegram_bot.db.base import proceed_schemas, drop_all_tables
+from telegram_bot.db.catalog import SKIN_CATALOG
+from telegram_bot.db.runtime import DB_RUNTIME
+from telegram_bot.midlewares.db_middleware import DBSessionMiddleware
+from telegram_bot.resources.http_client import HTTP_CLIENT
+from telegram_bot.resources.listing_recorder import LISTING_RECORDER
+from telegram_bot.steam.browser_pool import BROWSER_POOL
+from telegram_bot.steam.inspect_workers import INSPECT_POOL
 
 from telegram_bot.handlers import OtherHandler, OperationHandler, CommandHandler, SettingHandler, GeneralHandler
 
@@ -23,11 +30,13 @@ class Application:
         self.buttons = BotButtons()
         self.redis = aioredis.Redis()
         self.dp = Dispatcher(storage=RedisStorage(self.redis))
+        self.dp.update.outer_middleware(DBSessionMiddleware(DB_RUNTIME.session_maker))
         self.bot = Bot(token=os.getenv('token'), parse_mode=ParseMode.HTML)
 
     async def __init_db(self) -> None:
-        await drop_all_tables(ENGINE)
-        await proceed_schemas(ENGINE)
+        await drop_all_tables(DB_RUNTIME.engine)
+        await proceed_schemas(DB_RUNTIME.engine)
+        await SKIN_CATALOG.load(DB_RUNTIME.session_maker)
 
     async def __init_handlers(self, scheduler: AsyncScheduler) -> None:
         self.general_handler = GeneralHandler()
@@ -43,12 +52,19 @@ class Application:
 
     async def main(self) -> None:
         await self.__init_db()
-        data_store = SQLAlchemyDataStore(engine=ENGINE)
+        data_store = SQLAlchemyDataStore(engine=DB_RUNTIME.engine)
         async with AsyncScheduler(data_store=data_store) as scheduler:
             await self.__init_handlers(scheduler)
             self.dp.include_routers(*self.general_handler.router)
             await scheduler.start_in_background()
-            await self.dp.start_polling(self.bot)
+            try:
+                await self.dp.start_polling(self.bot)
+            finally:
+                await HTTP_CLIENT.close()
+                await LISTING_RECORDER.flush()
+                INSPECT_POOL.stop()
+                await BROWSER_POOL.close()
+                await DB_RUNTIME.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,26 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+from telegram_bot.resources.data_containers import ParamsSkinData
+
+
+class FloatResolver(ABC):
+    """Turns the inspect params of a Steam listing into its (float, paint seed)."""
+
+    @staticmethod
+    def key(params: ParamsSkinData) -> Tuple[int, int]:
+        return int(params.param_a), int(params.param_d)
+
+    @abstractmethod
+    async def resolve(self, params: ParamsSkinData) -> Tuple[float, int] | None:
+        pass
+
+    async def resolve_many(self, skins_params: List[ParamsSkinData]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+        resolved = await asyncio.gather(*map(self.resolve, skins_params))
+        return {
+            self.key(params): float_seed for params, float_seed in zip(skins_params, resolved) if float_seed is not None
+        }
+
+    async def save(self, weapon: str, skin: str, quality: str, stattrak: bool) -> None:
+        pass
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal, localcontext
+from typing import AsyncIterable, Iterable, List
+
+from telegram_bot.resources.data_containers import SkinDataCsm, SkinDataSteam
+
+
+def float_bucket(skin_float: float) -> Decimal:
+    with localcontext() as context:
+        context.prec = 2
+        return Decimal(skin_float) * 1
+
+
+class MatchingEngine(ABC):
+    min_percent = 15
+
+    def __init__(self) -> None:
+        self._csm_data: List[SkinDataCsm] = []
+
+    def load(self, csm_data: List[SkinDataCsm]) -> None:
+        self._csm_data = list(csm_data)
+        self._prepare()
+
+    async def match(self, steam_data: Iterable[SkinDataSteam] | AsyncIterable[SkinDataSteam]) -> AsyncIterable[dict]:
+        if isinstance(steam_data, AsyncIterable):
+            async for steam_skin in steam_data:
+                if matched_skin := self.match_skin(steam_skin):
+                    yield matched_skin
+        else:
+            for steam_skin in steam_data:
+                if matched_skin := self.match_skin(steam_skin):
+                    yield matched_skin
+
+    @staticmethod
+    def _float_key(skin_float: float) -> Decimal:
+        return float_bucket(skin_float)
+
+    @staticmethod
+    def _percent(steam_price: float, csm_price_with_float: float) -> float:
+        return 100 - ((steam_price * 100) // csm_price_with_float)
+
+    @property
+    def price_ceiling(self) -> float | None:
+        if not self._csm_data:
+            return None
+        max_price_with_float = max(csm_skin.price_with_float for csm_skin in self._csm_data)
+        return max_price_with_float * (100 - self.min_percent + 1) / 100
+
+    def _prepare(self) -> None:
+        pass
+
+    @abstractmethod
+    def match_skin(self, steam_skin: SkinDataSteam) -> dict | None:
+        pass
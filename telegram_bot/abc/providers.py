@@ -10,13 +10,15 @@ class DataProvider(ABC):
     _url_constructor = None
     in_queue = None
     out_queue = None
+    price_ceiling: float | None = None
+    candidate_filter = None
 
     async def get_processed_data(self):
         tasks = []
         async for web_data in self.in_queue:
             tasks.append(asyncio.create_task(self._data_worker(web_data)))
         await asyncio.gather(*tasks)
-        await self.out_queue.put(self.out_queue.SENTINEL)
+        await self.out_queue.close()
 
     @abstractmethod
     async def _data_worker(self, url_response: dict):
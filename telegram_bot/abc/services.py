@@ -1,9 +1,15 @@
 import abc
+from typing import List
 
 from telegram_bot.abc.url_constructors import URLConstructor
 
 
 class DataService(abc.ABC):
+    price_ceiling: float | None = None
+
+    def _past_price_ceiling(self, prices: List[float]) -> bool:
+        return self.price_ceiling is not None and bool(prices) and max(prices) > self.price_ceiling
+
     @abc.abstractmethod
     async def add_web_data(self):
         pass
@@ -1,9 +1,12 @@
 import bisect
 from abc import abstractmethod
 from collections import namedtuple, deque
+from typing import AsyncIterable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from telegram_bot.commands.abstact_command import BotCommand
-from telegram_bot.db.base import get_session_maker, ENGINE
+from telegram_bot.db.runtime import DB_RUNTIME
 from telegram_bot.db import db_query
 from telegram_bot.resources.parser_factory import Parser
 from telegram_bot.resources import settings
@@ -12,16 +15,24 @@ from telegram_bot.commands.bot_errors_command import InvalidWeapon, InvalidSkin
 
 
 class BotParserCommands(BotCommand):
-    def __init__(self, container: deque):
+    def __init__(self, container: deque, engine: str = 'sort_sweep', concurrent: bool = False):
         self.container = container
+        self.engine = engine
+        self.concurrent = concurrent
 
     @abstractmethod
     async def execute(self):
         pass
 
-    async def _parse_data(self, weapon: str, skin: str, quality: str, stattrak: bool):
-        matching_data_provider = CsmSteamMatchingDataGetter(weapon, skin, quality, stattrak)
+    async def _stream_data(self, weapon: str, skin: str, quality: str, stattrak: bool) -> AsyncIterable[dict]:
+        matching_data_provider = CsmSteamMatchingDataGetter(
+            weapon, skin, quality, stattrak, engine=self.engine, concurrent=self.concurrent
+        )
         async for item in matching_data_provider.compare_all_data():
+            yield item
+
+    async def _parse_data(self, weapon: str, skin: str, quality: str, stattrak: bool):
+        async for item in self._stream_data(weapon, skin, quality, stattrak):
             self.container.append(item)
 
 
@@ -102,7 +113,7 @@ class UserMsgParserCommand(BotParserCommands):
             stattrak: bool,
             container: deque,
     ) -> None:
-        super().__init__(container=container)
+        super().__init__(container=container, concurrent=True)
         self.weapon = weapon
         self.skin = skin
         self.quality = quality
@@ -111,14 +122,19 @@ class UserMsgParserCommand(BotParserCommands):
     async def execute(self):
         await self._parse_data(self.weapon, self.skin, self.quality, self.stattrak)
 
+    async def stream(self) -> AsyncIterable[dict]:
+        async for item in self._stream_data(self.weapon, self.skin, self.quality, self.stattrak):
+            yield item
+
 
 class DBParserCommand(BotParserCommands):
-    def __init__(self, container: deque):
-        super().__init__(container=container)
+    def __init__(self, container: deque, session_maker: async_sessionmaker | None = None, engine: str = 'numpy'):
+        super().__init__(container=container, engine=engine)
+        self.session_maker = session_maker
 
     async def execute(self):
         if weapon_data := await db_query.get_random_weapon_from_db(
-                get_session_maker(ENGINE)
+                self.session_maker or DB_RUNTIME.session_maker
         ):
             await self._parse_data(weapon_data[0], weapon_data[1], weapon_data[2], weapon_data[3])
 
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import random
+from json.decoder import JSONDecodeError
+from typing import Awaitable, Callable, Dict
+
+from aiohttp import ClientError
+from cachetools import TTLCache
+
+from telegram_bot.commands.bot_errors_command import RequestError
+
+
+class CsmPriceFetcher:
+    retry_exceptions = (ClientError, asyncio.TimeoutError, JSONDecodeError, RequestError)
+
+    def __init__(
+            self,
+            *,
+            concurrency: int = 8,
+            retries: int = 3,
+            backoff: float = 0.5,
+            cache_ttl: float = 600,
+            cache_size: int = 10000,
+    ) -> None:
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self._cache: TTLCache | None = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl else None
+        self._in_flight: Dict[int, asyncio.Future] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._in_flight.clear()
+            self._loop = loop
+
+    async def fetch(self, asset_id: int, url: str, request: Callable[[str], Awaitable[dict]]) -> dict:
+        if self._cache is not None and (price_json := self._cache.get(asset_id)) is not None:
+            return price_json
+
+        self._bind_loop()
+        while (future := self._in_flight.get(asset_id)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = self._loop.create_future()
+        self._in_flight[asset_id] = future
+        try:
+            price_json = await self._fetch_with_retries(url, request)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            future.exception()
+            raise
+        else:
+            future.set_result(price_json)
+            if self._cache is not None:
+                self._cache[asset_id] = price_json
+            return price_json
+        finally:
+            self._in_flight.pop(asset_id, None)
+
+    async def _fetch_with_retries(self, url: str, request: Callable[[str], Awaitable[dict]]) -> dict:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    return await request(url)
+            except self.retry_exceptions:
+                if attempt >= self.retries:
+                    raise
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def invalidate(self, asset_id: int | None = None) -> None:
+        if self._cache is None:
+            return
+        if asset_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(asset_id, None)
+
+
+PRICE_FETCHER = CsmPriceFetcher(
+    concurrency=int(os.getenv('csm_price_concurrency', 8)),
+    retries=int(os.getenv('csm_price_retries', 3)),
+    backoff=float(os.getenv('csm_price_backoff', 0.5)),
+    cache_ttl=float(os.getenv('csm_price_cache_ttl', 600)),
+)
@@ -3,23 +3,49 @@ import asyncio
 from decimal import Decimal, localcontext
 
 from bs4 import NavigableString, BeautifulSoup as bs
+from lxml import html
+from lxml.etree import ParserError
 
 from telegram_bot.abc.providers import DataProvider
 from telegram_bot.commands.bot_errors_command import InvalidName
+from telegram_bot.csm.price_fetcher import CsmPriceFetcher, PRICE_FETCHER
 from telegram_bot.resources.data_containers import SkinDataCsm
 
 
 class CSMWikiDataProvider(DataProvider):
-    def __init__(self, url_constructor, in_queue, out_queue) -> None:
+    """Reads the skin name and its qualities from a CS.Money wiki page.
+
+    The 'lxml' backend only evaluates two XPath queries on the parsed tree, 'bs4' builds the full soup.
+    """
+
+    def __init__(self, url_constructor, in_queue, out_queue, backend: str = 'lxml') -> None:
         self._url_constructor = url_constructor
         self.in_queue = in_queue
         self.out_queue = out_queue
+        self.backend = backend
 
     async def get_processed_data(self) -> None:
         async for web_data in self.in_queue:
-            soup = bs(web_data, 'lxml')
-            await self._data_worker(soup)
-        await self.out_queue.put(self.out_queue.SENTINEL)
+            if self.backend == 'lxml':
+                await self._lxml_data_worker(web_data)
+            else:
+                soup = bs(web_data, 'lxml')
+                await self._data_worker(soup)
+        await self.out_queue.close()
+
+    async def _lxml_data_worker(self, web_data: str) -> None:
+        try:
+            tree = html.fromstring(web_data)
+        except ParserError:
+            raise InvalidName
+        skin_name = tree.xpath('string(//title)')
+        qualities = [quality.text_content() for quality in tree.xpath('//th')]
+        if not skin_name or not qualities:
+            raise InvalidName
+        await self.out_queue.put(dict(
+            skin_name=await self.__get_correct_skin_name(skin_name),
+            quality_data=list(set(quality for quality in qualities if quality != ''))
+        ))
 
     @staticmethod
     async def __find_elements(soup: bs, parent) -> List[NavigableString] | NavigableString:
@@ -51,11 +77,12 @@ class CSMWikiDataProvider(DataProvider):
 
 
 class CsmSkinDataProvider(DataProvider):
-    def __init__(self, url_constructor, web, in_queue, out_queue):
+    def __init__(self, url_constructor, web, in_queue, out_queue, price_fetcher: CsmPriceFetcher = PRICE_FETCHER):
         self._url_constructor = url_constructor
         self.in_queue = in_queue
         self.out_queue = out_queue
         self._web = web
+        self._price_fetcher = price_fetcher
 
     async def _data_worker(self, url_json_response: dict) -> None:
         tasks = []
@@ -80,7 +107,9 @@ class CsmSkinDataProvider(DataProvider):
             ))
 
     async def _get_price(self, asset_id: int) -> float:
-        price_json = await self._web.get_price(self._url_constructor.create_url_price(asset_id))
+        price_json = await self._price_fetcher.fetch(
+            asset_id, self._url_constructor.create_url_price(asset_id), self._web.get_price
+        )
         price = price_json['defaultPrice']
         with localcontext() as context:
             price_with_csm_percent = price - (price / 100 * 8)
@@ -1,61 +1,112 @@
 from __future__ import annotations
 
-from aiohttp import ClientResponse, ClientSession
+import asyncio
+from collections import deque
+from typing import Deque
+
+from aiohttp import ClientResponse
 from fake_useragent import UserAgent
 from json.decoder import JSONDecodeError
 
 from telegram_bot.abc.services import DataService
 from telegram_bot.abc.url_constructors import URLConstructor
+from telegram_bot.commands.bot_errors_command import RequestError
+from telegram_bot.resources.http_client import HttpClient, HTTP_CLIENT
 from telegram_bot.resources.misc import ClosableQueue
+from telegram_bot.resources.proxy_pool import ProxyPool, CSM_PROXY_POOL
 
 
 class ResponseCSMWikiDataService(DataService):
-    def __init__(self, url_constructor: URLConstructor, queue: ClosableQueue) -> None:
+    def __init__(
+            self,
+            url_constructor: URLConstructor,
+            queue: ClosableQueue,
+            http_client: HttpClient = HTTP_CLIENT,
+            proxy_pool: ProxyPool = CSM_PROXY_POOL
+    ) -> None:
         super().__init__()
         self.url_constructor = url_constructor
         self.queue = queue
+        self._http_client = http_client
+        self._proxy_pool = proxy_pool
 
     async def add_web_data(self):
-        async with ClientSession() as session:
-            async with session.get(
-                    self.url_constructor.create_url(), headers={'user-agent': f'{UserAgent.random}'}) as response:
+        try:
+            async with self._http_client.get(
+                    self.url_constructor.create_url(), headers={'user-agent': f'{UserAgent.random}'},
+                    proxy_pool=self._proxy_pool
+            ) as response:
                 await self.queue.put(await response.text())
-        await self.queue.put(self.queue.SENTINEL)
+        finally:
+            await self.queue.close()
 
 
 class ResponseCSMDataService(DataService):
-    def __init__(self, url_constructor: URLConstructor, queue: ClosableQueue) -> None:
+    page_size = 60
+
+    def __init__(
+            self,
+            url_constructor: URLConstructor,
+            queue: ClosableQueue,
+            http_client: HttpClient = HTTP_CLIENT,
+            proxy_pool: ProxyPool = CSM_PROXY_POOL,
+            *,
+            prefetch: int = 1,
+    ) -> None:
         super().__init__()
         self.url_constructor = url_constructor
         self.queue = queue
+        self._http_client = http_client
+        self._proxy_pool = proxy_pool
+        self.prefetch = max(prefetch, 1)
+        self._end_offset: int | None = None
 
     async def add_web_data(self):
         offset = 0
-        page_size = 60
-        async with ClientSession() as session:
+        self._end_offset = None
+        pages: Deque[asyncio.Task] = deque()
+        try:
             while True:
-                self.url_constructor.offset = offset
-                url = self.url_constructor.create_url()
-                async with session.get(
-                        url, headers={'user-agent': f'{UserAgent.random}'}
-                ) as response:
-                    if not await self._response_check(response):
-                        break
-                offset += page_size
-            await self.queue.put(self.queue.SENTINEL)
-
-    async def _response_check(self, response: ClientResponse) -> bool:
+                while len(pages) < self.prefetch and (self._end_offset is None or offset < self._end_offset):
+                    pages.append(asyncio.create_task(self._get_page(offset)))
+                    offset += self.page_size
+                if not pages:
+                    break
+                web_data = await pages.popleft()
+                if web_data is False:
+                    break
+                if web_data is not None:
+                    await self.queue.put(web_data)
+        finally:
+            for page in pages:
+                page.cancel()
+            await self.queue.close()
+
+    async def _get_page(self, offset: int) -> dict | bool | None:
+        self.url_constructor.offset = offset
+        url = self.url_constructor.create_url()
+        async with self._http_client.get(
+                url, headers={'user-agent': f'{UserAgent.random}'}, proxy_pool=self._proxy_pool
+        ) as response:
+            if (web_data := await self._response_check(response)) is False:
+                self._end_offset = offset if self._end_offset is None else min(self._end_offset, offset)
+            return web_data
+
+    @staticmethod
+    async def _response_check(response: ClientResponse) -> dict | bool | None:
         try:
             web_data = await response.json(content_type=None)
             if web_data.get('error'):
                 return False
-            else:
-                await self.queue.put(web_data)
+            return web_data
         except JSONDecodeError:
-            pass
-        return True
+            return None
 
     async def get_price(self, url: str):
-        async with ClientSession() as session:
-            async with session.get(url, headers={'user-agent': f'{UserAgent.random}'}) as response:
-                return await response.json(content_type=None)
+        async with self._http_client.get(
+                url, headers={'user-agent': f'{UserAgent.random}'}, proxy_pool=self._proxy_pool
+        ) as response:
+            price_json = await response.json(content_type=None)
+        if not isinstance(price_json, dict) or 'defaultPrice' not in price_json:
+            raise RequestError
+        return price_json
@@ -5,10 +5,12 @@ __all__ = [
     'Skin',
     'Quality',
     'StatTrak',
+    'ListingObservation',
+    'SkinVariant',
 ]
 
 from .base import Base
 
 
 from .user_models import User
-from .skins_model import Weapon, Skin, Quality, StatTrak
\ No newline at end of file
+from .skins_model import Weapon, Skin, Quality, StatTrak, ListingObservation, SkinVariant
\ No newline at end of file
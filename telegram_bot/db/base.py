@@ -2,7 +2,7 @@ import os
 
 from sqlalchemy import URL
 
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, AsyncSession, create_async_engine, AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.orm import DeclarativeBase
 
 DB_URL = URL.create(
@@ -14,10 +14,6 @@ DB_URL = URL.create(
             database=os.getenv('db_name')
         )
 
-ENGINE = create_async_engine(
-            DB_URL, echo=True, pool_pre_ping=True,
-        )
-
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
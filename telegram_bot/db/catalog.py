@@ -0,0 +1,92 @@
+import random
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from telegram_bot.db.skins_model import (
+    Skin, StatTrak, Weapon, Quality, SkinVariant, quality_skin, weapon_skin, stattrak_skin
+)
+
+VariantKey = Tuple[int, int, int, int]
+
+
+class SkinCatalog:
+    """In-process copy of the weapon/skin/quality/stattrak lookup tables and the links between them.
+
+    It is loaded once and kept up to date by the db_query writers. invalidate() drops it, and the next
+    query loads it again.
+    """
+
+    def __init__(self) -> None:
+        self.weapons: Dict[str, int] = {}
+        self.skins: Dict[str, int] = {}
+        self.qualities: Dict[str, int] = {}
+        self.stattraks: Dict[bool, int] = {}
+        self.skin_weapons: Set[Tuple[int, int]] = set()
+        self.skin_qualities: Set[Tuple[int, int]] = set()
+        self.skin_stattraks: Set[Tuple[int, int]] = set()
+        self.variants: Dict[VariantKey, int] = {}
+        self.loaded = False
+
+    async def load(self, async_session: async_sessionmaker) -> None:
+        async with async_session() as session:
+            self.weapons = dict((await session.execute(select(Weapon.weapon_name, Weapon.weapon_id))).all())
+            self.skins = dict((await session.execute(select(Skin.skin_name, Skin.skin_id))).all())
+            self.qualities = dict((await session.execute(select(Quality.quality_title, Quality.quality_id))).all())
+            self.stattraks = dict(
+                (await session.execute(select(StatTrak.stattrak_status, StatTrak.stattrak_id))).all()
+            )
+            self.skin_weapons = set(
+                (await session.execute(select(weapon_skin.c.skin_id, weapon_skin.c.weapon_id))).all()
+            )
+            self.skin_qualities = set(
+                (await session.execute(select(quality_skin.c.skin_id, quality_skin.c.quality_id))).all()
+            )
+            self.skin_stattraks = set(
+                (await session.execute(select(stattrak_skin.c.skin_id, stattrak_skin.c.stattrak_id))).all()
+            )
+            self.variants = {
+                (weapon_id, skin_id, quality_id, stattrak_id): variant_id
+                for variant_id, weapon_id, skin_id, quality_id, stattrak_id in await session.execute(select(
+                    SkinVariant.variant_id, SkinVariant.weapon_id, SkinVariant.skin_id,
+                    SkinVariant.quality_id, SkinVariant.stattrak_id
+                ))
+            }
+        self.loaded = True
+
+    async def ensure_loaded(self, async_session: async_sessionmaker) -> None:
+        if not self.loaded:
+            await self.load(async_session)
+
+    def invalidate(self) -> None:
+        self.__init__()
+
+    def ids(self, weapon: str, skin: str, quality: str, stattrak: bool) -> Tuple[int | None, ...]:
+        return (
+            self.weapons.get(weapon),
+            self.skins.get(skin),
+            self.qualities.get(quality),
+            self.stattraks.get(stattrak),
+        )
+
+    def contains(self, weapon: str, skin: str, quality: str, stattrak: bool) -> bool:
+        return self.ids(weapon, skin, quality, stattrak) in self.variants
+
+    def random_variant(self) -> Tuple[str, str, str, bool] | None:
+        if not self.variants:
+            return None
+        weapon_id, skin_id, quality_id, stattrak_id = random.choice(list(self.variants))
+        return (
+            _name(self.weapons, weapon_id),
+            _name(self.skins, skin_id),
+            _name(self.qualities, quality_id),
+            _name(self.stattraks, stattrak_id),
+        )
+
+
+def _name(names: Dict, name_id: int):
+    return next(name for name, value in names.items() if value == name_id)
+
+
+SKIN_CATALOG = SkinCatalog()
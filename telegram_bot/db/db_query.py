@@ -1,12 +1,21 @@
 import asyncio
-from typing import Callable, Type, Tuple, Any
+import datetime
+from typing import Type, Tuple, Any, Iterable, Dict, Set
 
-from sqlalchemy import select, func, ScalarResult, Row, and_, delete
+from sqlalchemy import select, func, delete, tuple_, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert
 
-from telegram_bot.db.skins_model import Skin, StatTrak, Weapon, Quality, SteamSkinData
+from telegram_bot.abc.matching_engines import float_bucket
+from telegram_bot.db.catalog import SkinCatalog, SKIN_CATALOG
+from telegram_bot.db.skins_model import (
+    Skin, StatTrak, Weapon, Quality, SteamSkinData, ListingObservation, SkinVariant,
+    quality_skin, weapon_skin, stattrak_skin
+)
 from telegram_bot.db.user_models import User
+from telegram_bot.resources.data_containers import ParamsSkinData, SkinDataCsm, SkinDataSteam
+
+_listing_partitions: Set[datetime.date] = set()
 
 
 async def remove_user(async_session: async_sessionmaker, user_id: int):
@@ -52,40 +61,28 @@ async def get_users(async_session: async_sessionmaker):
 
 
 async def is_skin_exists(
-        async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool
-) -> ScalarResult[Skin] | None:
-    async with async_session() as session:
-        stmt = (
-            select(Skin.skin_name, Weapon.weapon_name, Quality.quality_title, StatTrak.stattrak_status)
-            .join(Skin.weapons)
-            .join(Skin.qualities)
-            .join(Skin.stattraks)
-            .where(and_(
-                Skin.skin_name == skin,
-                Weapon.weapon_name == weapon,
-                Quality.quality_title == quality,
-                StatTrak.stattrak_status == stattrak,
-            ))
-        )
-        sql_result = await session.execute(stmt)
-        return sql_result.one_or_none()
+        async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool,
+        catalog: SkinCatalog = SKIN_CATALOG
+) -> Tuple[str, str, str, bool] | None:
+    await catalog.ensure_loaded(async_session)
+    if catalog.contains(weapon, skin, quality, stattrak):
+        return skin, weapon, quality, stattrak
+    return None
 
 
 async def add_steam_skin_data(
         async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool,
-        offset: float, seed: int, price: float, link: str, param_a: str, param_m: str, param_s: str, param_d: str
+        offset: float, seed: int, price: float, link: str, param_a: str, param_m: str, param_s: str, param_d: str,
+        catalog: SkinCatalog = SKIN_CATALOG
 ):
+    await catalog.ensure_loaded(async_session)
+    weapon_id, skin_id, quality_id, stattrak_id = catalog.ids(weapon, skin, quality, stattrak)
     async with async_session() as session:
-        weapon = await _select_obj_with_attrs(session, Weapon, 'weapon_name', weapon)
-        skin = await _select_obj_with_attrs(session, Skin, 'skin_name', skin)
-        quality = await _select_obj_with_attrs(session, Quality, 'quality_title', quality)
-        stattrak = await _select_obj_with_attrs(session, StatTrak, 'stattrak_status', stattrak)
-
         stmt = insert(SteamSkinData).values(
-            skin_id=skin.skin_id,
-            weapon_id=weapon.weapon_id,
-            quality_id=quality.quality_id,
-            stattrak_id=stattrak.stattrak_id,
+            skin_id=skin_id,
+            weapon_id=weapon_id,
+            quality_id=quality_id,
+            stattrak_id=stattrak_id,
             offset=offset,
             seed=seed,
             price=price,
@@ -99,76 +96,141 @@ async def add_steam_skin_data(
         await session.commit()
 
 
+async def get_steam_skins_inspect_data(
+        async_session: async_sessionmaker, params: Iterable[Tuple[int, int]]
+) -> Dict[Tuple[int, int], Tuple[float, int]]:
+    params = [(str(param_a), str(param_d)) for param_a, param_d in params]
+    if not params:
+        return {}
+    async with async_session() as session:
+        stmt = (
+            select(SteamSkinData.param_a, SteamSkinData.param_d, SteamSkinData.offset, SteamSkinData.seed)
+            .where(tuple_(SteamSkinData.param_a, SteamSkinData.param_d).in_(params))
+        )
+        result = await session.execute(stmt)
+        return {
+            (int(param_a), int(param_d)): (skin_float, seed) for param_a, param_d, skin_float, seed in result.all()
+        }
 
 
-async def _select_obj_with_attrs(
-        session: AsyncSession, class_obj: Callable, class_attribute, class_value,
-) -> Row | None:
-    stmt = select(class_obj).where(class_obj.__dict__[class_attribute] == class_value)
-    result = await session.execute(stmt)
-    item = result.scalar_one_or_none()
-    return item
+async def upsert_steam_skins_data(
+        async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool,
+        skins_data: Iterable[Tuple[ParamsSkinData, SkinDataSteam]],
+        catalog: SkinCatalog = SKIN_CATALOG,
+        chunk_size: int = 1000
+) -> None:
+    rows = {
+        str(params.param_d): dict(
+            offset=steam_skin.skin_float,
+            seed=steam_skin.skin_seed,
+            price=steam_skin.price,
+            link=steam_skin.link,
+            param_a=str(params.param_a),
+            param_m=str(params.param_m),
+            param_s=str(params.param_s),
+            param_d=str(params.param_d)
+        ) for params, steam_skin in skins_data
+    }
+    if not rows:
+        return
+    await catalog.ensure_loaded(async_session)
+    weapon_id, skin_id, quality_id, stattrak_id = catalog.ids(weapon, skin, quality, stattrak)
+    for row in rows.values():
+        row.update(skin_id=skin_id, weapon_id=weapon_id, quality_id=quality_id, stattrak_id=stattrak_id)
+
+    rows = list(rows.values())
+    async with async_session() as session:
+        for start in range(0, len(rows), chunk_size):
+            stmt = insert(SteamSkinData).values(rows[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SteamSkinData.param_d],
+                set_={column: stmt.excluded[column] for column in rows[0] if column != 'param_d'}
+            )
+            await session.execute(stmt)
+        await session.commit()
 
 
 async def add_new_skin_to_db(
         async_session: async_sessionmaker,
         weapon_name: str, skin_name: str, stattrak_status: bool,
-        *quality_data
+        *quality_data,
+        catalog: SkinCatalog = SKIN_CATALOG
 ) -> None:
+    await catalog.ensure_loaded(async_session)
     async with async_session() as session:
-        skin = await _select_obj_with_attrs(session, Skin, 'skin_name', skin_name)
-        if skin is None:
-            skin = await session.scalar(
-                insert(Skin).values(skin_name=skin_name).returning(Skin)
+        skin_id = catalog.skins.get(skin_name) or await _get_or_create_id(
+            session, Skin.skin_id, Skin.skin_name, skin_name
+        )
+        weapon_id = catalog.weapons.get(weapon_name) or await _get_or_create_id(
+            session, Weapon.weapon_id, Weapon.weapon_name, weapon_name
+        )
+        stattrak_id = catalog.stattraks.get(stattrak_status) or await _get_or_create_id(
+            session, StatTrak.stattrak_id, StatTrak.stattrak_status, stattrak_status
+        )
+        quality_ids = {
+            quality_title: catalog.qualities.get(quality_title) or await _get_or_create_id(
+                session, Quality.quality_id, Quality.quality_title, quality_title
+            ) for quality_title in quality_data
+        }
+
+        new_skin_weapons = {(skin_id, weapon_id)} - catalog.skin_weapons
+        new_skin_stattraks = {(skin_id, stattrak_id)} - catalog.skin_stattraks
+        new_skin_qualities = {(skin_id, quality_id) for quality_id in quality_ids.values()} - catalog.skin_qualities
+        if new_skin_weapons:
+            await session.execute(
+                insert(weapon_skin).values(skin_id=skin_id, weapon_id=weapon_id).on_conflict_do_nothing()
             )
-
-        weapon = await _select_obj_with_attrs(session, Weapon, 'weapon_name', weapon_name)
-        if weapon is None:
-            weapon = await session.scalar(
-                insert(Weapon).values(weapon_name=weapon_name).returning(Weapon)
+        if new_skin_stattraks:
+            await session.execute(
+                insert(stattrak_skin).values(skin_id=skin_id, stattrak_id=stattrak_id).on_conflict_do_nothing()
             )
-        skin_weapons = await skin.awaitable_attrs.weapons
-        if weapon not in skin_weapons:
-            skin_weapons.append(weapon)
-
-        stattrak = await _select_obj_with_attrs(
-            session, StatTrak, 'stattrak_status', stattrak_status
-        )
-        if stattrak is None:
-            stattrak = await session.scalar(
-                insert(StatTrak).values(stattrak_status=stattrak_status).returning(StatTrak)
+        if new_skin_qualities:
+            await session.execute(insert(quality_skin).values([
+                dict(skin_id=link_skin_id, quality_id=quality_id) for link_skin_id, quality_id in new_skin_qualities
+            ]).on_conflict_do_nothing())
+
+        new_variants = {
+            (weapon_id, skin_id, quality_id, stattrak_id) for quality_id in quality_ids.values()
+        } - catalog.variants.keys()
+        variant_ids = {}
+        if new_variants:
+            stmt = insert(SkinVariant).values([
+                dict(weapon_id=w_id, skin_id=s_id, quality_id=q_id, stattrak_id=st_id)
+                for w_id, s_id, q_id, st_id in new_variants
+            ]).on_conflict_do_nothing().returning(
+                SkinVariant.variant_id, SkinVariant.weapon_id, SkinVariant.skin_id,
+                SkinVariant.quality_id, SkinVariant.stattrak_id
             )
-        skin_stattraks = await skin.awaitable_attrs.stattraks
-        if stattrak not in skin_stattraks:
-            skin_stattraks.append(stattrak)
-
-        for item in quality_data:
-            quality = await _select_obj_with_attrs(session, Quality, 'quality_title', item)
-            if quality is None:
-                quality = await session.scalar(
-                    insert(Quality).values(quality_title=item).returning(Quality),
-                )
-            skin_qualities = await skin.awaitable_attrs.qualities
-            if quality not in skin_qualities:
-                skin_qualities.append(quality)
+            variant_ids = {
+                (w_id, s_id, q_id, st_id): variant_id
+                for variant_id, w_id, s_id, q_id, st_id in await session.execute(stmt)
+            }
 
         await session.commit()
 
+    catalog.skins[skin_name] = skin_id
+    catalog.weapons[weapon_name] = weapon_id
+    catalog.stattraks[stattrak_status] = stattrak_id
+    catalog.qualities.update(quality_ids)
+    catalog.skin_weapons |= new_skin_weapons
+    catalog.skin_stattraks |= new_skin_stattraks
+    catalog.skin_qualities |= new_skin_qualities
+    catalog.variants.update(variant_ids)
+
+
+async def _get_or_create_id(session: AsyncSession, id_column, name_column, value) -> int:
+    stmt = insert(id_column.class_).values({name_column.key: value}).on_conflict_do_nothing().returning(id_column)
+    if (obj_id := await session.scalar(stmt)) is None:
+        obj_id = await session.scalar(select(id_column).where(name_column == value))
+    return obj_id
+
 
 async def get_random_weapon_from_db(
-        async_session: async_sessionmaker
-) -> Row[Tuple[str, str, str, bool]] | None:
-    async with async_session() as session:
-        stmt = (
-            select(Weapon.weapon_name, Skin.skin_name, Quality.quality_title, StatTrak.stattrak_status)
-            .join(Skin.weapons)
-            .join(Skin.qualities)
-            .join(Skin.stattraks)
-            .order_by(func.random())
-            .limit(1)
-        )
-        result = await session.execute(stmt)
-        return result.one_or_none()
+        async_session: async_sessionmaker,
+        catalog: SkinCatalog = SKIN_CATALOG
+) -> Tuple[str, str, str, bool] | None:
+    await catalog.ensure_loaded(async_session)
+    return catalog.random_variant()
 
 
 async def get_all_skin_from_db(async_session: async_sessionmaker):
@@ -180,3 +242,74 @@ async def get_all_skin_from_db(async_session: async_sessionmaker):
         result = await session.execute(stmt)
         return result.all()
 
+
+async def _ensure_listing_partitions(session: AsyncSession, days: Iterable[datetime.date]) -> Set[datetime.date]:
+    table = ListingObservation.__tablename__
+    created = set(days) - _listing_partitions
+    for day in sorted(created):
+        await session.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {table}_{day:%Y%m%d} PARTITION OF {table} '
+            f"FOR VALUES FROM ('{day.isoformat()} 00:00+00') TO ('{day + datetime.timedelta(days=1)} 00:00+00')"
+        ))
+    return created
+
+
+async def add_listing_observations(
+        async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool, source: str,
+        listings: Iterable[SkinDataSteam | SkinDataCsm],
+        observed_at: datetime.datetime | None = None,
+        catalog: SkinCatalog = SKIN_CATALOG
+) -> None:
+    observed_at = observed_at or datetime.datetime.now(datetime.timezone.utc)
+    await catalog.ensure_loaded(async_session)
+    weapon_id, skin_id, quality_id, stattrak_id = catalog.ids(weapon, skin, quality, stattrak)
+    if None in (weapon_id, skin_id, quality_id, stattrak_id):
+        return
+    rows = [
+        dict(
+            observed_at=observed_at,
+            source=source,
+            skin_id=skin_id,
+            weapon_id=weapon_id,
+            quality_id=quality_id,
+            stattrak_id=stattrak_id,
+            skin_float=listing.skin_float,
+            float_bucket=float_bucket(listing.skin_float),
+            price=listing.price,
+            price_with_float=getattr(listing, 'price_with_float', None)
+        ) for listing in listings if listing.price
+    ]
+    if not rows:
+        return
+    async with async_session() as session:
+        created = await _ensure_listing_partitions(
+            session, {observed_at.astimezone(datetime.timezone.utc).date()}
+        )
+        await session.execute(insert(ListingObservation).values(rows))
+        await session.commit()
+    _listing_partitions.update(created)
+
+
+async def get_median_listing_price(
+        async_session: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool, skin_float: float,
+        hours: float = 24, source: str = 'steam',
+        catalog: SkinCatalog = SKIN_CATALOG
+) -> float | None:
+    await catalog.ensure_loaded(async_session)
+    weapon_id, skin_id, quality_id, stattrak_id = catalog.ids(weapon, skin, quality, stattrak)
+    if None in (weapon_id, skin_id, quality_id, stattrak_id):
+        return None
+    async with async_session() as session:
+        stmt = (
+            select(func.percentile_cont(0.5).within_group(ListingObservation.price))
+            .where(
+                ListingObservation.skin_id == skin_id,
+                ListingObservation.weapon_id == weapon_id,
+                ListingObservation.quality_id == quality_id,
+                ListingObservation.stattrak_id == stattrak_id,
+                ListingObservation.observed_at >= func.now() - datetime.timedelta(hours=hours),
+                ListingObservation.source == source,
+                ListingObservation.float_bucket == float_bucket(skin_float),
+            )
+        )
+        return await session.scalar(stmt)
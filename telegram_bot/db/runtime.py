@@ -0,0 +1,44 @@
+import os
+
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from telegram_bot.db.base import DB_URL, get_session_maker
+
+
+class DBRuntime:
+    """Owns the process wide engine and session maker, handed to handlers through middleware data."""
+
+    def __init__(
+            self,
+            url: URL,
+            *,
+            pool_size: int = 10,
+            max_overflow: int = 20,
+            pool_recycle: int = 1800,
+            statement_cache_size: int = 500,
+            echo: bool = False,
+    ) -> None:
+        self.engine: AsyncEngine = create_async_engine(
+            url.update_query_dict({'prepared_statement_cache_size': str(statement_cache_size)}),
+            echo=echo,
+            pool_pre_ping=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            query_cache_size=statement_cache_size,
+        )
+        self.session_maker: async_sessionmaker[AsyncSession] = get_session_maker(self.engine)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+
+DB_RUNTIME = DBRuntime(
+    DB_URL,
+    pool_size=int(os.getenv('db_pool_size', 10)),
+    max_overflow=int(os.getenv('db_max_overflow', 20)),
+    pool_recycle=int(os.getenv('db_pool_recycle', 1800)),
+    statement_cache_size=int(os.getenv('db_statement_cache_size', 500)),
+    echo=os.getenv('db_echo', '0') == '1',
+)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import datetime
+from decimal import Decimal
 from typing import List
 
 from sqlalchemy import (
@@ -10,7 +12,14 @@ from sqlalchemy import (
     Table, 
     Boolean,
     Float,
-    BigInteger
+    BigInteger,
+    DateTime,
+    Identity,
+    Index,
+    Numeric,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+    func
     )
 
 from sqlalchemy.orm import (
@@ -28,21 +37,24 @@ quality_skin: Table = Table(
     db_const.quality_skin_table,
     Base.metadata,
     Column('quality_id', Integer, ForeignKey("qualities.quality_id")),
-    Column('skin_id', Integer, ForeignKey("skins.skin_id"))
+    Column('skin_id', Integer, ForeignKey("skins.skin_id")),
+    PrimaryKeyConstraint('quality_id', 'skin_id')
     )
 
 weapon_skin: Table = Table(
     db_const.skin_weapon_table,
     Base.metadata,
     Column('weapon_id', Integer, ForeignKey('weapons.weapon_id')),
-    Column('skin_id', Integer, ForeignKey('skins.skin_id'))
+    Column('skin_id', Integer, ForeignKey('skins.skin_id')),
+    PrimaryKeyConstraint('weapon_id', 'skin_id')
 )
 
 stattrak_skin: Table = Table(
     db_const.stattrak_skin,
     Base.metadata, 
     Column('stattrak_id', Integer, ForeignKey('stattraks.stattrak_id')),
-    Column('skin_id', Integer, ForeignKey('skins.skin_id'))
+    Column('skin_id', Integer, ForeignKey('skins.skin_id')),
+    PrimaryKeyConstraint('stattrak_id', 'skin_id')
 )
 
 
@@ -91,13 +103,13 @@ class SteamSkinData(Base):
 
     stattrak_id: Mapped[int] = Column(Integer, ForeignKey('stattraks.stattrak_id'))
 
-    offset: Mapped[float] = mapped_column(Float, unique=True, nullable=False)
+    offset: Mapped[float] = mapped_column(Float, nullable=False)
 
     seed: Mapped[int] = mapped_column(Integer, nullable=False)
 
     price: Mapped[float] = mapped_column(Float, nullable=False)
 
-    link: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    link: Mapped[str] = mapped_column(String, nullable=False)
 
     param_a: Mapped[int] = mapped_column(String, unique=True, nullable=False)
 
@@ -108,6 +120,58 @@ class SteamSkinData(Base):
     param_d: Mapped[int] = mapped_column(String, unique=True, nullable=False)
 
 
+class SkinVariant(Base):
+    __tablename__ = 'skin_variant'
+    __table_args__ = (
+        UniqueConstraint('weapon_id', 'skin_id', 'quality_id', 'stattrak_id', name='uq_skin_variant_combination'),
+    )
+
+    variant_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    weapon_id: Mapped[int] = mapped_column(Integer, ForeignKey('weapons.weapon_id'), nullable=False)
+
+    skin_id: Mapped[int] = mapped_column(Integer, ForeignKey('skins.skin_id'), nullable=False)
+
+    quality_id: Mapped[int] = mapped_column(Integer, ForeignKey('qualities.quality_id'), nullable=False)
+
+    stattrak_id: Mapped[int] = mapped_column(Integer, ForeignKey('stattraks.stattrak_id'), nullable=False)
+
+
+class ListingObservation(Base):
+    __tablename__ = 'listing_observations'
+    __table_args__ = (
+        Index(
+            'ix_listing_observations_variant_observed_at',
+            'skin_id', 'weapon_id', 'quality_id', 'stattrak_id', 'observed_at'
+        ),
+        {'postgresql_partition_by': 'RANGE (observed_at)'},
+    )
+
+    observation_id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+
+    observed_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
+    source: Mapped[str] = mapped_column(String(16), nullable=False)
+
+    skin_id: Mapped[int] = Column(Integer, ForeignKey('skins.skin_id'))
+
+    weapon_id: Mapped[int] = Column(Integer, ForeignKey('weapons.weapon_id'))
+
+    quality_id: Mapped[int] = Column(Integer, ForeignKey('qualities.quality_id'))
+
+    stattrak_id: Mapped[int] = Column(Integer, ForeignKey('stattraks.stattrak_id'))
+
+    skin_float: Mapped[float] = mapped_column(Float, nullable=False)
+
+    float_bucket: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+
+    price_with_float: Mapped[float] = mapped_column(Float, nullable=True)
+
+
 class Quality(Base):
     __tablename__ = 'qualities'
 
@@ -7,12 +7,12 @@ from aiogram.types import Message
 from apscheduler import AsyncScheduler, ScheduleLookupError
 from apscheduler.triggers.interval import IntervalTrigger
 from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from telegram_bot.abc.handlers import Handler
 from telegram_bot.db.db_query import get_all_skin_from_db
 from telegram_bot.resources.bot_buttons import BotButtons
 from telegram_bot.commands.operation_commands import UserMsgParserCommand, DBParserCommand, UserMsgCommand
-from telegram_bot.db.base import get_session_maker, ENGINE
 from telegram_bot.db import db_query
 from telegram_bot.midlewares.operations_middleware import GetterDefaultSettings
 from telegram_bot.resources import tg_const, user_msg_const as user_msg
@@ -47,9 +47,9 @@ class OperationHandler(Handler):
 
     async def _register_handlers(self) -> None:
         @self._router.message(F.text == 'Показати список скінів доступних в базі')
-        async def selected_show_skins_in_db(message: Message) -> None:
+        async def selected_show_skins_in_db(message: Message, session_maker: async_sessionmaker) -> None:
             text = ''
-            if item := await get_all_skin_from_db(get_session_maker(ENGINE)):
+            if item := await get_all_skin_from_db(session_maker):
                 for data in item:
                     weapon, skin = data
                     text += f'{weapon}, {skin}'
@@ -70,13 +70,15 @@ class OperationHandler(Handler):
             OperationStates.find_skin_by_db_state,
             F.text == tg_const.on
         )
-        async def find_from_db_operation(message: Message, state: FSMContext) -> None:
+        async def find_from_db_operation(
+                message: Message, state: FSMContext, session_maker: async_sessionmaker
+        ) -> None:
             try:
                 await self.scheduler.get_schedule(f"db_parser_task_{message.from_user.id}")
             except ScheduleLookupError:
                 await state.clear()
                 await message.answer('Пошук по базі розпочато!', reply_markup=self.buttons.main_keyboard)
-                db_parser_command = DBParserCommand(self.matched_skins_queue)
+                db_parser_command = DBParserCommand(self.matched_skins_queue, session_maker)
                 await self.scheduler.add_schedule(
                     db_parser_command.execute,
                     IntervalTrigger(minutes=7),
@@ -108,11 +110,14 @@ class OperationHandler(Handler):
             OperationStates.add_new_skin_by_db,
             F.text != tg_const.back_button_txt
         )
-        async def add_new_skin_operation(message: Message, state: FSMContext, stattrak: bool, quality: str) -> None:
+        async def add_new_skin_operation(
+                message: Message, state: FSMContext, stattrak: bool, quality: str, session_maker: async_sessionmaker
+        ) -> None:
             user_msg_constructor = UserMsgCommand(message.text, stattrak_default=stattrak, quality_default=quality)
             try:
                 weapon_data = await user_msg_constructor.execute()
                 if await self._add_to_db_if_skin_exists(
+                    session_maker,
                     weapon_data.weapon,
                     weapon_data.skin,
                     weapon_data.quality,
@@ -141,22 +146,24 @@ class OperationHandler(Handler):
             OperationStates.find_skin_by_msg_state,
             F.text != tg_const.back_button_txt
         )
-        async def find_skins_from_user_msg(message: Message, state: FSMContext, stattrak: bool, quality: str) -> None:
+        async def find_skins_from_user_msg(
+                message: Message, state: FSMContext, stattrak: bool, quality: str, session_maker: async_sessionmaker
+        ) -> None:
 
             if (weapon_data := await self._execute_user_msg_finder(
-                    message, state, stattrak, quality
+                    message, state, stattrak, quality, session_maker
             )).quality_data is None:
                 await message.answer(user_msg.nothing_find_text)
             else:
-                await self._add_to_db_if_skin_exists(*weapon_data)
+                await self._add_to_db_if_skin_exists(session_maker, *weapon_data)
 
             while self.matched_skins_queue:
-                await self._show_data(self.matched_skins_queue.pop())
+                await self._show_data(self.matched_skins_queue.pop(), session_maker)
             else:
                 await message.answer(user_msg.nothing_find_text)
 
-    async def _show_data(self, skin):
-        for user in await db_query.get_users(get_session_maker(ENGINE)):
+    async def _show_data(self, skin, session_maker: async_sessionmaker):
+        for user in await db_query.get_users(session_maker):
             await self.bot.send_message(
                 chat_id=user.user_id,
                 text=tg_const.msg_with_skins_data.format(
@@ -184,17 +191,18 @@ class OperationHandler(Handler):
         )
 
     async def _add_to_db_if_skin_exists(
-            self, weapon: str, skin: str, quality: str, stattrak: bool, quality_data: tuple
+            self, session_maker: async_sessionmaker, weapon: str, skin: str, quality: str, stattrak: bool,
+            quality_data: tuple
     ):
         if not await db_query.is_skin_exists(
-                get_session_maker(ENGINE),
+                session_maker,
                 weapon=weapon,
                 skin=skin,
                 quality=quality,
                 stattrak=stattrak
         ):
             await db_query.add_new_skin_to_db(
-                get_session_maker(ENGINE),
+                session_maker,
                 weapon,
                 skin,
                 stattrak,
@@ -215,7 +223,9 @@ class OperationHandler(Handler):
         )
         return weapon_data
 
-    async def _execute_user_msg_finder(self, message: Message, state: FSMContext, stattrak, quality):
+    async def _execute_user_msg_finder(
+            self, message: Message, state: FSMContext, stattrak, quality, session_maker: async_sessionmaker
+    ):
         try:
             weapon_data = await self._execute_user_msg_constructor(message, stattrak, quality)
             await state.clear()
@@ -228,7 +238,8 @@ class OperationHandler(Handler):
                 stattrak=weapon_data.stattrak
             )
 
-            await user_msg_parser_command.execute()
+            async for skin in user_msg_parser_command.stream():
+                await self._show_data(skin, session_maker)
         except Exception as error:
             error_handler_command = ErrorsHandlerCommand(error, message, self.buttons, state)
             is_handled = await error_handler_command.execute()
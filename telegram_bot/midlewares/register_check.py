@@ -4,8 +4,6 @@ from aiogram import BaseMiddleware
 from aiogram.types import Message
 from redis import asyncio as aioredis
 
-
-from telegram_bot.db.base import get_session_maker, ENGINE
 from telegram_bot.db import db_query
 
 
@@ -23,11 +21,12 @@ class RegisterCheck(BaseMiddleware):
         #await self.redis.delete(str(event.from_user.id))
         if await self.redis.get(name=str(event.from_user.id)):
             return await handler(event, data)
+        session_maker = data['session_maker']
         if not await db_query.is_user_exists(
-                get_session_maker(ENGINE), event.from_user.id
+                session_maker, event.from_user.id
         ):
             await db_query.add_user(
-                get_session_maker(ENGINE),
+                session_maker,
                 event.from_user.id,
                 event.from_user.username,
                 event.from_user.full_name
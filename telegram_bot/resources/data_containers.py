@@ -30,3 +30,27 @@ class ParamsSkinData(NamedTuple):
     param_s: int
     param_d: int
     param_a: int
+
+
+class QueueMetrics(NamedTuple):
+    depth: int
+    max_depth: int
+    items_in: int
+    items_out: int
+    throughput: float
+    put_wait: float
+    get_wait: float
+
+
+class SteamAccount(NamedTuple):
+    login: str
+    password: str
+    two_factor_code: str | None = None
+
+
+class ProxyStats(NamedTuple):
+    proxy: str | None
+    latency: float
+    error_rate: float
+    in_flight: int
+    cooling_down: bool
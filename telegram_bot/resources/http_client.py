@@ -0,0 +1,101 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
+from yarl import URL
+
+from telegram_bot.resources.proxy_pool import ProxyPool
+from telegram_bot.resources.rate_limiter import AdaptiveRateLimiter, RATE_LIMITER
+
+
+class HttpClient:
+    def __init__(
+            self,
+            *,
+            limit: int = 100,
+            limit_per_host: int = 10,
+            keepalive_timeout: float = 30,
+            ttl_dns_cache: int = 300,
+            total_timeout: float = 30,
+            connect_timeout: float = 10,
+            rate_limiter: AdaptiveRateLimiter | None = None,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.rate_limiter = rate_limiter
+        self._session: ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.ttl_dns_cache,
+                ),
+                timeout=self.timeout,
+            )
+            self._loop = loop
+        return self._session
+
+    @asynccontextmanager
+    async def get(
+            self, url: str, *, proxy_pool: ProxyPool | None = None, session_key: str | None = None,
+            rate_limited: bool = True, **kwargs
+    ) -> AsyncIterator[ClientResponse]:
+        host = URL(url).host
+        rate_limiter = self.rate_limiter if rate_limited else None
+        if rate_limiter is not None:
+            await rate_limiter.acquire(host)
+
+        if proxy_pool is None:
+            async with self.session.get(url, **kwargs) as response:
+                await self._report_rate(rate_limiter, host, response)
+                yield response
+            return
+
+        proxy = proxy_pool.acquire(session_key)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        latency, ok = None, False
+        try:
+            async with self.session.get(url, proxy=proxy, **kwargs) as response:
+                latency = loop.time() - started
+                ok = await self._report_rate(rate_limiter, host, response) and response.status < 500
+                yield response
+        finally:
+            proxy_pool.release(proxy, latency if latency is not None else loop.time() - started, ok)
+
+    @staticmethod
+    async def _report_rate(
+            rate_limiter: AdaptiveRateLimiter | None, host: str, response: ClientResponse
+    ) -> bool:
+        if rate_limiter is None:
+            return response.status != 429
+        body = await response.read() if response.content_type.startswith('text/') else b''
+        return rate_limiter.report(host, response.status, body)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+HTTP_CLIENT = HttpClient(
+    limit=int(os.getenv('http_limit', 100)),
+    limit_per_host=int(os.getenv('http_limit_per_host', 10)),
+    keepalive_timeout=float(os.getenv('http_keepalive_timeout', 30)),
+    ttl_dns_cache=int(os.getenv('http_dns_cache_ttl', 300)),
+    total_timeout=float(os.getenv('http_total_timeout', 30)),
+    connect_timeout=float(os.getenv('http_connect_timeout', 10)),
+    rate_limiter=RATE_LIMITER,
+)
@@ -0,0 +1,58 @@
+import asyncio
+import datetime
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from telegram_bot.db import db_query
+from telegram_bot.db.runtime import DB_RUNTIME
+from telegram_bot.resources.data_containers import SkinDataCsm, SkinDataSteam
+
+ObservationKey = Tuple[str, str, str, bool, str, datetime.datetime]
+
+
+class ListingRecorder:
+    """Buffers the listings seen by the parsers and writes them to the observation history in the background."""
+
+    def __init__(self, async_session: async_sessionmaker | None = None, *, batch_size: int = 200) -> None:
+        self._async_session = async_session
+        self.batch_size = batch_size
+        self._buffer: Dict[ObservationKey, List[SkinDataSteam | SkinDataCsm]] = defaultdict(list)
+        self._size = 0
+        self._flush_task: asyncio.Task | None = None
+
+    def record(
+            self, weapon: str, skin: str, quality: str, stattrak: bool, source: str,
+            listings: Iterable[SkinDataSteam | SkinDataCsm]
+    ) -> None:
+        if self._async_session is None:
+            return
+        listings = list(listings)
+        observed_at = datetime.datetime.now(datetime.timezone.utc)
+        self._buffer[(weapon, skin, quality, stattrak, source, observed_at)].extend(listings)
+        self._size += len(listings)
+        if self._size < self.batch_size or (self._flush_task is not None and not self._flush_task.done()):
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            pass
+
+    async def flush(self) -> None:
+        buffer, self._buffer, self._size = self._buffer, defaultdict(list), 0
+        for (weapon, skin, quality, stattrak, source, observed_at), listings in buffer.items():
+            try:
+                await db_query.add_listing_observations(
+                    self._async_session, weapon, skin, quality, stattrak, source, listings, observed_at
+                )
+            except Exception:
+                logging.exception('Could not record %s listings for %s | %s', source, weapon, skin)
+
+
+LISTING_RECORDER = ListingRecorder(
+    DB_RUNTIME.session_maker if os.getenv('record_listings', '1') == '1' else None,
+    batch_size=int(os.getenv('record_listings_batch_size', 200)),
+)
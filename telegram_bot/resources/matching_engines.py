@@ -0,0 +1,238 @@
+import asyncio
+import bisect
+from collections import deque
+from decimal import Decimal, localcontext
+from operator import itemgetter
+from typing import AsyncIterable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from telegram_bot.abc.matching_engines import MatchingEngine
+from telegram_bot.resources.data_containers import SkinDataCsm, SkinDataSteam
+
+
+class GatherMatchingEngine(MatchingEngine):
+    """Pairwise engine: one coroutine per (steam_skin, csm_skin) pair, kept as a reference implementation."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.matched_data = deque()
+
+    async def match(self, steam_data: Iterable[SkinDataSteam] | AsyncIterable[SkinDataSteam]) -> AsyncIterable[dict]:
+        if isinstance(steam_data, AsyncIterable):
+            steam_data = [steam_skin async for steam_skin in steam_data]
+        for steam_skin in steam_data:
+            tasks = []
+            for csm_skin in self._csm_data:
+                coro = self._comparing_data(steam_skin, csm_skin, self._csm_data)
+                tasks.append(coro)
+            await asyncio.gather(*tasks)
+            if self.matched_data:
+                yield self._pop_max_percent()
+
+    def match_skin(self, steam_skin: SkinDataSteam) -> dict | None:
+        for csm_skin in list(self._csm_data):
+            self._comparing_data_sync(steam_skin, csm_skin, self._csm_data)
+        if self.matched_data:
+            return self._pop_max_percent()
+
+    def _pop_max_percent(self) -> dict:
+        max_percent_skin = max(self.matched_data, key=itemgetter('percent'))
+        self.matched_data.clear()
+        return max_percent_skin
+
+    async def _comparing_data(self, skin_data_1, skin_data_2, pop_list) -> None:
+        self._comparing_data_sync(skin_data_1, skin_data_2, pop_list)
+
+    def _comparing_data_sync(self, skin_data_1, skin_data_2, pop_list) -> None:
+        with localcontext() as context:
+            context.prec = 2
+            steam_float = Decimal(skin_data_1.skin_float) * 1
+            csm_float = Decimal(skin_data_2.skin_float) * 1
+            if steam_float == csm_float:
+                percent = self._percent(skin_data_1.price, skin_data_2.price_with_float)
+                if percent >= self.min_percent:
+                    self.matched_data.append(
+                        {
+                            'steam_skin': skin_data_1,
+                            'csm_skin': pop_list.pop(bisect.bisect_left(pop_list, skin_data_2)),
+                            'percent': percent
+                        }
+                    )
+
+
+class SortSweepMatchingEngine(MatchingEngine):
+    """Sorts CS.Money skins once by rounded float and bisects each Steam skin into its float bucket.
+
+    Inside a bucket skins are ordered by price with float, so the best match for a Steam skin is always
+    the last unused skin of the bucket. Like the pairwise engine, a match also uses up every other skin of
+    the bucket the Steam skin beats by min_percent, which is a suffix of the unused part of the bucket.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._keys: List[Decimal] = []
+        self._skins: List[SkinDataCsm] = []
+        self._bucket_ends: Dict[Decimal, int] = {}
+
+    def _prepare(self) -> None:
+        indexed_skins = sorted(
+            (
+                (self._float_key(csm_skin.skin_float), csm_skin.price_with_float, -index), csm_skin
+            ) for index, csm_skin in enumerate(self._csm_data)
+        )
+        self._keys = [sort_key[0] for sort_key, _ in indexed_skins]
+        self._skins = [csm_skin for _, csm_skin in indexed_skins]
+        self._bucket_ends.clear()
+
+    def match_skin(self, steam_skin: SkinDataSteam) -> dict | None:
+        key = self._float_key(steam_skin.skin_float)
+        start = bisect.bisect_left(self._keys, key)
+        if (end := self._bucket_ends.get(key)) is None:
+            end = bisect.bisect_right(self._keys, key, lo=start)
+        if end == start:
+            return None
+
+        csm_skin = self._skins[end - 1]
+        percent = self._percent(steam_skin.price, csm_skin.price_with_float)
+        if percent < self.min_percent:
+            return None
+
+        last = end - 1
+        while last > start and self._beats(steam_skin, self._skins[last - 1]):
+            last -= 1
+        self._bucket_ends[key] = last
+        return {
+            'steam_skin': steam_skin,
+            'csm_skin': csm_skin,
+            'percent': percent
+        }
+
+    def _beats(self, steam_skin: SkinDataSteam, csm_skin: SkinDataCsm) -> bool:
+        return self._percent(steam_skin.price, csm_skin.price_with_float) >= self.min_percent
+
+
+class CandidateFilter(SortSweepMatchingEngine):
+    """Replays the sort sweep over listings as they are inspected to know which float buckets are still open.
+
+    price_ceiling only covers the CS.Money skins that were not taken yet, so a listing above it cannot be a hit
+    whatever its float turns out to be.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._bucket_bounds: Dict[Decimal, Tuple[int, int]] = {}
+
+    def _prepare(self) -> None:
+        super()._prepare()
+        self._bucket_bounds.clear()
+        for index, key in enumerate(self._keys):
+            start, _ = self._bucket_bounds.get(key, (index, index))
+            self._bucket_bounds[key] = start, index + 1
+
+    @property
+    def price_ceiling(self) -> float:
+        max_price_with_float = max(
+            (
+                self._skins[last - 1].price_with_float
+                for key, (start, end) in self._bucket_bounds.items()
+                if (last := self._bucket_ends.get(key, end)) > start
+            ),
+            default=0.0
+        )
+        return max_price_with_float * (100 - self.min_percent + 1) / 100
+
+
+class NumpyMatchingEngine(MatchingEngine):
+    """Batched engine: float equality mask and discount percents for all pairs are computed as array operations."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._float_codes: Dict[Decimal, int] = {}
+        self._csm_codes = np.empty(0, dtype=np.int64)
+        self._price_with_float = np.empty(0, dtype=np.float64)
+        self._available = np.empty(0, dtype=bool)
+
+    def _prepare(self) -> None:
+        self._float_codes.clear()
+        self._csm_codes = np.fromiter(
+            (
+                self._float_codes.setdefault(self._float_key(csm_skin.skin_float), len(self._float_codes))
+                for csm_skin in self._csm_data
+            ),
+            dtype=np.int64, count=len(self._csm_data)
+        )
+        self._price_with_float = np.fromiter(
+            (csm_skin.price_with_float for csm_skin in self._csm_data), dtype=np.float64, count=len(self._csm_data)
+        )
+        self._available = np.ones(len(self._csm_data), dtype=bool)
+
+    async def match(self, steam_data: Iterable[SkinDataSteam] | AsyncIterable[SkinDataSteam]) -> AsyncIterable[dict]:
+        if isinstance(steam_data, AsyncIterable):
+            async for matched_skin in super().match(steam_data):
+                yield matched_skin
+            return
+
+        steam_data = list(steam_data)
+        if not steam_data or not self._csm_data:
+            return
+
+        steam_codes = np.fromiter(
+            (self._float_codes.get(self._float_key(steam_skin.skin_float), -1) for steam_skin in steam_data),
+            dtype=np.int64, count=len(steam_data)
+        )
+        steam_prices = np.fromiter(
+            (steam_skin.price for steam_skin in steam_data), dtype=np.float64, count=len(steam_data)
+        )
+        mask = steam_codes[:, np.newaxis] == self._csm_codes[np.newaxis, :]
+        percents = np.where(
+            mask,
+            100 - np.floor_divide(steam_prices[:, np.newaxis] * 100, self._price_with_float[np.newaxis, :]),
+            -np.inf
+        )
+        for steam_skin, steam_percents in zip(steam_data, percents):
+            if matched_skin := self._pick_best(steam_skin, steam_percents):
+                yield matched_skin
+
+    def match_skin(self, steam_skin: SkinDataSteam) -> dict | None:
+        if (code := self._float_codes.get(self._float_key(steam_skin.skin_float))) is None:
+            return None
+        percents = np.where(
+            self._csm_codes == code,
+            100 - np.floor_divide(steam_skin.price * 100, self._price_with_float),
+            -np.inf
+        )
+        return self._pick_best(steam_skin, percents)
+
+    def _pick_best(self, steam_skin: SkinDataSteam, percents: np.ndarray) -> dict | None:
+        if not percents.size:
+            return None
+        percents = np.where(self._available, percents, -np.inf)
+        best_percent = percents.max()
+        if best_percent < self.min_percent:
+            return None
+
+        candidates = np.flatnonzero(percents == best_percent)
+        index = candidates[np.argmax(self._price_with_float[candidates])]
+        self._available[percents >= self.min_percent] = False
+        return {
+            'steam_skin': steam_skin,
+            'csm_skin': self._csm_data[index],
+            'percent': float(best_percent)
+        }
+
+
+class Matcher:
+    _registry: dict = {}
+
+    def __init__(self) -> None:
+        self._init_engines()
+
+    def _init_engines(self) -> None:
+        self._registry['gather'] = GatherMatchingEngine
+        self._registry['sort_sweep'] = SortSweepMatchingEngine
+        self._registry['numpy'] = NumpyMatchingEngine
+
+    def create_engine(self, engine: str) -> MatchingEngine:
+        class_ = self._registry[engine]
+        return class_()
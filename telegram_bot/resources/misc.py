@@ -1,19 +1,99 @@
+import time
 from asyncio import Queue
+from typing import Any, Hashable, Iterable, List, Set
 
 from aiogram.fsm.state import StatesGroup, State
 
+from telegram_bot.resources.data_containers import QueueMetrics
+
 
 class ClosableQueue(Queue):
-    SENTINEL = object
+    SENTINEL = object()
+
+    def __init__(self, maxsize: int = 0, *, producers: int = 1) -> None:
+        super().__init__(maxsize)
+        self._producers = producers
+        self._closed_by: Set[Hashable] = set()
+        self._drained = False
+        self._started_at = time.perf_counter()
+        self._max_depth = 0
+        self._items_in = 0
+        self._items_out = 0
+        self._put_wait = 0.0
+        self._get_wait = 0.0
+
+    async def close(self, producer: Hashable | None = None) -> None:
+        if self._producers <= 0 or producer is not None and producer in self._closed_by:
+            return
+        if producer is not None:
+            self._closed_by.add(producer)
+        self._producers -= 1
+        if self._producers == 0:
+            await self.put(self.SENTINEL)
+
+    async def put(self, item: Any) -> None:
+        start = time.perf_counter()
+        await super().put(item)
+        self._put_wait += time.perf_counter() - start
+
+    def put_nowait(self, item: Any) -> None:
+        super().put_nowait(item)
+        if item is not self.SENTINEL:
+            self._items_in += 1
+            self._max_depth = max(self._max_depth, self.qsize())
+
+    async def put_many(self, items: Iterable[Any]) -> None:
+        for item in items:
+            await self.put(item)
+
+    async def get(self) -> Any:
+        start = time.perf_counter()
+        item = await super().get()
+        self._get_wait += time.perf_counter() - start
+        return item
+
+    def get_nowait(self) -> Any:
+        item = super().get_nowait()
+        if item is not self.SENTINEL:
+            self._items_out += 1
+        return item
+
+    async def get_batch(self, max_items: int) -> List[Any]:
+        batch = []
+        if self._drained:
+            return batch
+        item = await self.get()
+        while True:
+            self.task_done()
+            if item is self.SENTINEL:
+                self._drained = True
+                return batch
+            batch.append(item)
+            if len(batch) >= max_items or self.empty():
+                return batch
+            item = self.get_nowait()
 
-    async def close(self):
-        await self.put(self.SENTINEL)
+    @property
+    def metrics(self) -> QueueMetrics:
+        elapsed = time.perf_counter() - self._started_at
+        return QueueMetrics(
+            depth=self.qsize(),
+            max_depth=self._max_depth,
+            items_in=self._items_in,
+            items_out=self._items_out,
+            throughput=self._items_out / elapsed if elapsed else 0.0,
+            put_wait=self._put_wait,
+            get_wait=self._get_wait,
+        )
 
     async def __aiter__(self):
+        if self._drained:
+            return
         while True:
             item = await self.get()
             try:
                 if item is self.SENTINEL:
+                    self._drained = True
                     return
                 yield item
             finally:
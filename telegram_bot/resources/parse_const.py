@@ -9,6 +9,7 @@ extensions = (
 )
 
 
+vpn_popup_url = 'chrome-extension://adlpodnneegcnbophopdmhedicjbcgco/popup.html'
 
 float_checker_select_menu = """
             return document.querySelector('csgofloat-utility-belt')
@@ -1,11 +1,17 @@
 import asyncio
+import logging
+import os
 from typing import AsyncIterable, Any, List
 
 from telegram_bot.csm.providers import CsmSkinDataProvider, CSMWikiDataProvider
 from telegram_bot.csm.services import ResponseCSMWikiDataService, ResponseCSMDataService
 from telegram_bot.csm.url_constructors import SkinsCSMWikiUrl, SkinsCsmUrl
+from telegram_bot.resources.data_containers import SkinDataCsm
+from telegram_bot.resources.listing_recorder import ListingRecorder, LISTING_RECORDER
+from telegram_bot.resources.matching_engines import CandidateFilter
 from telegram_bot.resources.misc import ClosableQueue
 
+from telegram_bot.steam.float_resolvers import Resolver
 from telegram_bot.steam.providers import ApiSteamSkinDataProvider, SeleniumSteamSkinDataProvider
 from telegram_bot.steam.services import SeleniumSteamDataService, ApiSteamDataService
 from telegram_bot.steam.url_constructors import SkinSteamUrl, SkinSteamApiUrl
@@ -15,33 +21,120 @@ class ParserInterface:
     _url_constructor = None
     _web = None
     _provider = None
-
-    def __init__(self):
-        self.service_queue = ClosableQueue()
-        self.done_queue = ClosableQueue()
+    queue_size = 100
+    record_batch_size = 100
+    source: str | None = None
+
+    def __init__(self, recorder: ListingRecorder = LISTING_RECORDER):
+        self._recorder = recorder
+        self.service_queue = ClosableQueue(maxsize=self.queue_size)
+        self.done_queue = ClosableQueue(maxsize=self.queue_size)
+        self._collect_task: asyncio.Task | None = None
+
+    async def collect(self) -> None:
+        tasks = [
+            asyncio.create_task(self._web.add_web_data()),
+            asyncio.create_task(self._provider.get_processed_data()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            drain = asyncio.create_task(self._drain(self.service_queue))
+            await asyncio.gather(*tasks, return_exceptions=True)
+            drain.cancel()
+            await self.done_queue.close()
+            raise
+
+    @staticmethod
+    async def _drain(queue: ClosableQueue) -> None:
+        async for _ in queue:
+            pass
+
+    def set_price_ceiling(self, price_ceiling: float | None) -> None:
+        self._web.price_ceiling = price_ceiling
+        self._provider.price_ceiling = price_ceiling
+
+    def set_candidate_filter(self, csm_data: List[SkinDataCsm]) -> None:
+        candidate_filter = CandidateFilter()
+        candidate_filter.load(csm_data)
+        self._provider.candidate_filter = candidate_filter
+
+    def start(self) -> None:
+        if self._collect_task is None:
+            self._collect_task = asyncio.create_task(self.collect())
+
+    async def stop(self) -> None:
+        if self._collect_task is None or self._collect_task.done():
+            return
+        self._collect_task.cancel()
+        drains = [asyncio.create_task(self._drain(queue)) for queue in (self.service_queue, self.done_queue)]
+        await asyncio.gather(self._collect_task, return_exceptions=True)
+        for drain in drains:
+            drain.cancel()
+
+    async def stream(self) -> AsyncIterable[Any]:
+        self.start()
+        observed = []
+        try:
+            while batch := await self.done_queue.get_batch(self.queue_size):
+                for data in batch:
+                    if self.source is not None:
+                        observed.append(data)
+                        if len(observed) >= self.record_batch_size:
+                            self._record(observed)
+                            observed = []
+                    yield data
+            await self._collect_task
+        finally:
+            await self.stop()
+            if observed:
+                self._record(observed)
+            logging.debug(
+                '%s queues: service %s, done %s',
+                type(self).__name__, self.service_queue.metrics, self.done_queue.metrics
+            )
+
+    def _record(self, observed: List[Any]) -> None:
+        self._recorder.record(
+            self._url_constructor.weapon,
+            self._url_constructor.skin,
+            self._url_constructor.quality,
+            self._url_constructor.stattrak,
+            self.source,
+            observed
+        )
 
     async def run(self) -> List[Any]:
-        await asyncio.gather(self._web.add_web_data(), self._provider.get_processed_data())
-        return [data async for data in self.done_queue]
+        return [data async for data in self.stream()]
 
 
 class CsmWikiSteamParser(ParserInterface):
+    wiki_backend = os.getenv('csm_wiki_backend', 'lxml')
+
     def __init__(self, weapon: str, skin: str, quality: str, stattrak: bool):
         super().__init__()
         self._url_constructor = SkinsCSMWikiUrl(weapon, skin, quality, stattrak)
         self._web = ResponseCSMWikiDataService(self._url_constructor, self.service_queue)
-        self._provider = CSMWikiDataProvider(self._url_constructor, self.service_queue, self.done_queue)
+        self._provider = CSMWikiDataProvider(
+            self._url_constructor, self.service_queue, self.done_queue, self.wiki_backend
+        )
 
 
 class CsmSteamParser(ParserInterface):
+    source = 'csm'
+
     def __init__(self, weapon: str, skin: str, quality: str, stattrak: bool):
         super().__init__()
         self._url_constructor = SkinsCsmUrl(weapon, skin, quality, stattrak)
-        self._web = ResponseCSMDataService(self._url_constructor, self.service_queue)
+        self._web = ResponseCSMDataService(self._url_constructor, self.service_queue, prefetch=4)
         self._provider = CsmSkinDataProvider(self._url_constructor, self._web, self.service_queue, self.done_queue)
 
 
 class SeleniumSteamParser(ParserInterface):
+    source = 'steam'
+
     def __init__(self, weapon: str, skin: str, quality: str, stattrak: bool):
         super().__init__()
         self._url_constructor = SkinSteamUrl(weapon, skin, quality, stattrak)
@@ -50,6 +143,8 @@ class SeleniumSteamParser(ParserInterface):
         
 
 class ApiSteamParser(ParserInterface):
+    source = 'steam'
+
     def __init__(self, weapon: str, skin: str, quality: str, stattrak: bool):
         super().__init__()
         self._url_constructor = SkinSteamApiUrl(weapon, skin, quality, stattrak)
@@ -57,6 +152,21 @@ class ApiSteamParser(ParserInterface):
         self._provider = ApiSteamSkinDataProvider(self._url_constructor, self.service_queue, self.done_queue)
 
 
+class RenderSteamParser(ParserInterface):
+    """Browserless Steam parser: render JSON pages plus a float resolver instead of Edge and the extension."""
+    source = 'steam'
+    float_resolver = os.getenv('steam_float_resolver', 'inspect_service')
+
+    def __init__(self, weapon: str, skin: str, quality: str, stattrak: bool):
+        super().__init__()
+        self._url_constructor = SkinSteamApiUrl(weapon, skin, quality, stattrak)
+        self._web = ApiSteamDataService(self._url_constructor, self.service_queue)
+        self._provider = ApiSteamSkinDataProvider(
+            self._url_constructor, self.service_queue, self.done_queue,
+            Resolver().create_resolver(self.float_resolver)
+        )
+
+
 class Parser:
     _registry: dict = {}
 
@@ -73,6 +183,7 @@ class Parser:
         self._registry['csm'] = CsmSteamParser
         self._registry['selenium_steam'] = SeleniumSteamParser
         self._registry['api_steam'] = ApiSteamParser
+        self._registry['render_steam'] = RenderSteamParser
 
     def create_parser(self, parser: str) -> ParserInterface:
         class_ = self._registry[parser]
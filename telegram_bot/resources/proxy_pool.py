@@ -0,0 +1,98 @@
+import os
+import time
+from typing import Dict, List
+
+from cachetools import TTLCache
+
+from telegram_bot.resources.data_containers import ProxyStats
+
+
+class _ProxyState:
+    __slots__ = ('proxy', 'latency', 'error_rate', 'samples', 'in_flight', 'cooldown_until')
+
+    def __init__(self, proxy: str | None) -> None:
+        self.proxy = proxy
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.samples = 0
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+
+    def score(self) -> float:
+        return (self.latency + 0.01) * (1 + 4 * self.error_rate) * (1 + self.in_flight)
+
+
+class ProxyPool:
+    """Rotates requests over the configured proxies, preferring the fast and healthy ones.
+
+    Latency and error rate are exponentially weighted per proxy, a proxy whose error rate
+    crosses max_error_rate sits out a cooldown, and a session key pins a caller to one proxy.
+    None stands for a direct connection.
+    """
+
+    def __init__(
+            self,
+            proxies: List[str | None],
+            *,
+            alpha: float = 0.3,
+            max_error_rate: float = 0.5,
+            min_samples: int = 3,
+            cooldown: float = 60,
+            sticky_ttl: float = 300,
+    ) -> None:
+        self._states: Dict[str | None, _ProxyState] = {proxy: _ProxyState(proxy) for proxy in proxies or [None]}
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._sticky: TTLCache = TTLCache(maxsize=10000, ttl=sticky_ttl)
+
+    def acquire(self, session_key: str | None = None) -> str | None:
+        now = time.monotonic()
+        available = [state for state in self._states.values() if state.cooldown_until <= now]
+        if not available:
+            available = [min(self._states.values(), key=lambda state: state.cooldown_until)]
+
+        state = None
+        if session_key is not None and (sticky := self._sticky.get(session_key)) is not None:
+            state = next((candidate for candidate in available if candidate.proxy == sticky), None)
+        if state is None:
+            state = min(available, key=_ProxyState.score)
+        if session_key is not None:
+            self._sticky[session_key] = state.proxy
+        state.in_flight += 1
+        return state.proxy
+
+    def release(self, proxy: str | None, latency: float, ok: bool) -> None:
+        if (state := self._states.get(proxy)) is None:
+            return
+        state.in_flight = max(state.in_flight - 1, 0)
+        state.samples += 1
+        state.latency = latency if state.samples == 1 else state.latency + self.alpha * (latency - state.latency)
+        state.error_rate += self.alpha * ((0.0 if ok else 1.0) - state.error_rate)
+        if state.samples >= self.min_samples and state.error_rate > self.max_error_rate:
+            state.cooldown_until = time.monotonic() + self.cooldown
+            state.error_rate = self.max_error_rate / 2
+
+    @property
+    def stats(self) -> List[ProxyStats]:
+        now = time.monotonic()
+        return [
+            ProxyStats(state.proxy, state.latency, state.error_rate, state.in_flight, state.cooldown_until > now)
+            for state in self._states.values()
+        ]
+
+
+def _proxies_from_env(name: str, default: str = '') -> List[str | None]:
+    return [proxy.strip() or None for proxy in os.getenv(name, default).split(',')]
+
+
+STEAM_PROXY_POOL = ProxyPool(
+    _proxies_from_env('steam_proxies', 'http://51.38.191.151:80'),
+    cooldown=float(os.getenv('proxy_cooldown', 60)),
+)
+
+CSM_PROXY_POOL = ProxyPool(
+    _proxies_from_env('csm_proxies'),
+    cooldown=float(os.getenv('proxy_cooldown', 60)),
+)
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import time
+from typing import Dict
+
+from telegram_bot.resources import parse_const
+
+
+class _TokenBucket:
+    __slots__ = ('rate', 'tokens', 'updated', 'changed', 'throttled')
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.tokens = burst
+        self.updated = self.changed = time.monotonic()
+        self.throttled = float('-inf')
+
+
+class AdaptiveRateLimiter:
+    """Token bucket per host with additive increase / multiplicative decrease of the rate.
+
+    A 429 or Steam's "too many requests" page halves the host's rate, every recovery_interval
+    without one gives back `increase` requests per second, up to max_rate.
+    """
+
+    def __init__(
+            self,
+            *,
+            rate: float = 5,
+            burst: float = 5,
+            min_rate: float = 0.2,
+            max_rate: float = 20,
+            decrease: float = 0.5,
+            increase: float = 0.5,
+            recovery_interval: float = 10,
+            rates: Dict[str, float] | None = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.decrease = decrease
+        self.increase = increase
+        self.recovery_interval = recovery_interval
+        self.rates = rates or {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+
+    def _bucket(self, host: str) -> _TokenBucket:
+        if (bucket := self._buckets.get(host)) is None:
+            bucket = self._buckets[host] = _TokenBucket(self.rates.get(host, self.rate), self.burst)
+        return bucket
+
+    def _refill(self, bucket: _TokenBucket) -> None:
+        now = time.monotonic()
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+        bucket.updated = now
+
+    async def acquire(self, host: str) -> None:
+        bucket = self._bucket(host)
+        while True:
+            self._refill(bucket)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return
+            await asyncio.sleep((1 - bucket.tokens) / bucket.rate)
+
+    def throttle(self, host: str) -> None:
+        bucket = self._bucket(host)
+        now = time.monotonic()
+        if now - bucket.throttled < 1 / bucket.rate:
+            return
+        bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+        bucket.tokens = min(bucket.tokens, 0)
+        bucket.changed = bucket.throttled = now
+
+    def success(self, host: str) -> None:
+        bucket = self._bucket(host)
+        now = time.monotonic()
+        if bucket.rate < self.max_rate and now - bucket.changed >= self.recovery_interval:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+            bucket.changed = now
+
+    def report(self, host: str, status: int, body: bytes | str = b'') -> bool:
+        if isinstance(body, str):
+            body = body.encode()
+        if status == 429 or parse_const.request_exception_str.encode() in body:
+            self.throttle(host)
+            return False
+        self.success(host)
+        return True
+
+    def current_rate(self, host: str) -> float:
+        return self._bucket(host).rate
+
+
+RATE_LIMITER = AdaptiveRateLimiter(
+    rate=float(os.getenv('rate_limit', 5)),
+    burst=float(os.getenv('rate_limit_burst', 5)),
+    max_rate=float(os.getenv('rate_limit_max', 20)),
+    rates={
+        'steamcommunity.com': float(os.getenv('steam_rate_limit', 1)),
+    },
+)
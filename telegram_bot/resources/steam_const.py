@@ -14,7 +14,27 @@ get_number_total_pages = 'searchResults_total'
 
 msg_table_error = 'market_listing_table_message'
 
-float_checker_get_float = """
-    return document.querySelectorAll('csgofloat-item-row-wrapper')
+float_checker_rows_loaded = """
+    const text = item => item ? item.innerText || (item.shadowRoot && item.shadowRoot.textContent) || '' : '';
+    const rows = Array.from(document.querySelectorAll('#searchResultsRows .market_listing_row'));
+    return rows.length > 0 && rows.every(
+        row => /Float:\\s*\\d/.test(text(row.querySelector('csgofloat-item-row-wrapper')))
+    );
     """
 
+float_checker_page_records = """
+    const text = item => item ? item.innerText || (item.shadowRoot && item.shadowRoot.textContent) || '' : '';
+    return Array.from(document.querySelectorAll('#searchResultsRows .market_listing_row')).map(row => {
+        const floatText = text(row.querySelector('csgofloat-item-row-wrapper'));
+        const skinFloat = floatText.match(/Float:\\s*([\\d.]+)/);
+        const skinSeed = floatText.match(/Paint Seed:\\s*(\\d+)/);
+        const price = row.querySelector('.market_listing_price_with_fee');
+        const link = row.querySelector('.item_market_action_button');
+        return {
+            float: skinFloat ? parseFloat(skinFloat[1]) : null,
+            seed: skinSeed ? parseInt(skinSeed[1], 10) : null,
+            price: price ? price.innerText.trim() : null,
+            href: link ? link.getAttribute('href') : null,
+        };
+    });
+    """
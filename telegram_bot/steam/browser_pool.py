@@ -0,0 +1,119 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from fake_useragent import UserAgent
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+
+from telegram_bot.resources import parse_const
+from telegram_bot.steam import page_waits
+
+
+class BrowserPool:
+    """Keeps warmed up Edge sessions (extensions loaded, VPN connected) that scans borrow and give back."""
+
+    def __init__(self, size: int = 2, *, max_uses: int = 50, headless: bool = False) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self._idle: List[webdriver.Edge] = []
+        self._uses: dict = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _create_options(self) -> EdgeOptions:
+        options = EdgeOptions()
+        for extension in parse_const.extensions:
+            options.add_extension(extension)
+        if self.headless:
+            options.add_argument(parse_const.headless_browser)
+        options.add_argument(f'user-agent={UserAgent.random}')
+        return options
+
+    async def _create_driver(self) -> webdriver.Edge:
+        driver = await asyncio.to_thread(
+            webdriver.Edge, self._create_options(), EdgeService(parse_const.driver_root_edge)
+        )
+        try:
+            await self._prep_vpn(driver)
+        except WebDriverException:
+            await self._quit(driver)
+            raise
+        self._uses[driver] = 0
+        return driver
+
+    @staticmethod
+    async def _prep_vpn(driver: webdriver.Edge) -> None:
+        driver.get(parse_const.vpn_popup_url)
+        accept_button = await page_waits.wait_until(
+            driver, page_waits.element_clickable(By.CLASS_NAME, 'analytics__button'), timeout=10
+        )
+        accept_button.click()
+        vpn_button = await page_waits.wait_until(
+            driver, page_waits.element_clickable(By.CLASS_NAME, 'connect-button'), timeout=10
+        )
+        vpn_state = vpn_button.get_attribute('class')
+        vpn_button.click()
+        await page_waits.wait_optional(driver, page_waits.attribute_changed(vpn_button, 'class', vpn_state), timeout=5)
+
+    @staticmethod
+    def _is_healthy(driver: webdriver.Edge) -> bool:
+        try:
+            return bool(driver.window_handles)
+        except WebDriverException:
+            return False
+
+    async def _quit(self, driver: webdriver.Edge) -> None:
+        self._uses.pop(driver, None)
+        try:
+            await asyncio.to_thread(driver.quit)
+        except WebDriverException:
+            pass
+
+    async def _borrow(self) -> webdriver.Edge:
+        while self._idle:
+            driver = self._idle.pop()
+            if self._is_healthy(driver):
+                return driver
+            await self._quit(driver)
+        return await self._create_driver()
+
+    async def _give_back(self, driver: webdriver.Edge, broken: bool) -> None:
+        self._uses[driver] = self._uses.get(driver, 0) + 1
+        if broken or self._uses[driver] >= self.max_uses or not self._is_healthy(driver):
+            await self._quit(driver)
+        else:
+            self._idle.append(driver)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[webdriver.Edge]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        async with self._semaphore:
+            driver = await self._borrow()
+            broken = False
+            try:
+                yield driver
+            except TimeoutException:
+                raise
+            except WebDriverException:
+                broken = True
+                raise
+            finally:
+                await self._give_back(driver, broken)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for driver in idle:
+            await self._quit(driver)
+
+
+BROWSER_POOL = BrowserPool(
+    size=int(os.getenv('browser_pool_size', 2)),
+    max_uses=int(os.getenv('browser_max_uses', 50)),
+    headless=os.getenv('browser_headless', '0') == '1',
+)
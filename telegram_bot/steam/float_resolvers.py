@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+from typing import Dict, List, Tuple
+
+from aiohttp import ClientError
+
+from telegram_bot.abc.float_resolvers import FloatResolver
+from telegram_bot.resources.data_containers import ParamsSkinData, SkinDataSteam
+from telegram_bot.resources.http_client import HttpClient, HTTP_CLIENT
+from telegram_bot.steam.inspect_cache import InspectCache, INSPECT_CACHE
+from telegram_bot.steam.inspect_workers import InspectWorkerPool, INSPECT_POOL
+
+
+class GcPoolFloatResolver(FloatResolver):
+    def __init__(self, inspect_pool: InspectWorkerPool = INSPECT_POOL) -> None:
+        self._inspect_pool = inspect_pool
+
+    async def resolve(self, params: ParamsSkinData) -> Tuple[float, int] | None:
+        return await self._inspect_pool.inspect(params)
+
+
+class InspectServiceFloatResolver(FloatResolver):
+    """Asks a csgofloat compatible inspect service, so no Steam account lives in this process."""
+
+    def __init__(self, url: str, *, concurrency: int = 10, http_client: HttpClient = HTTP_CLIENT) -> None:
+        self.url = url
+        self.concurrency = concurrency
+        self._http_client = http_client
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+
+    async def resolve(self, params: ParamsSkinData) -> Tuple[float, int] | None:
+        self._bind_loop()
+        query = {'s': params.param_s, 'a': params.param_a, 'd': params.param_d, 'm': params.param_m}
+        try:
+            async with self._semaphore, self._http_client.get(self.url, params=query, rate_limited=False) as response:
+                item_info = (await response.json(content_type=None))['iteminfo']
+            return float(item_info['floatvalue']), int(item_info['paintseed'])
+        except (ClientError, asyncio.TimeoutError, ValueError, KeyError, TypeError):
+            logging.warning('Inspect service failed for asset %s', params.param_a)
+            return None
+
+
+class CachedFloatResolver(FloatResolver):
+    """Answers from the inspect cache first and only sends the misses to the backend.
+
+    Without a backend it is a pure stand-in that serves what was inspected before.
+    """
+
+    def __init__(self, backend: FloatResolver | None = None, inspect_cache: InspectCache = INSPECT_CACHE) -> None:
+        self._backend = backend
+        self._inspect_cache = inspect_cache
+        self._inspected: List[Tuple[ParamsSkinData, SkinDataSteam]] = []
+
+    async def resolve(self, params: ParamsSkinData) -> Tuple[float, int] | None:
+        return (await self.resolve_many([params])).get(self.key(params))
+
+    async def resolve_many(self, skins_params: List[ParamsSkinData]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+        resolved = await self._inspect_cache.get_many(skins_params)
+        missing = [params for params in skins_params if self.key(params) not in resolved]
+        if self._backend is None or not missing:
+            return resolved
+
+        resolved.update(await self._backend.resolve_many(missing))
+        for params in missing:
+            if (float_seed := resolved.get(self.key(params))) is None:
+                continue
+            steam_skin = SkinDataSteam(
+                price=params.price, skin_float=float_seed[0], link=params.link_to_buy, skin_seed=float_seed[1]
+            )
+            self._inspect_cache.add(params, steam_skin)
+            self._inspected.append((params, steam_skin))
+        return resolved
+
+    async def save(self, weapon: str, skin: str, quality: str, stattrak: bool) -> None:
+        inspected, self._inspected = self._inspected, []
+        await self._inspect_cache.save(weapon, skin, quality, stattrak, inspected)
+
+
+class Resolver:
+    _registry: dict = {}
+
+    def __init__(self) -> None:
+        self._init_resolvers()
+
+    def _init_resolvers(self) -> None:
+        self._registry['gc'] = lambda: CachedFloatResolver(GcPoolFloatResolver())
+        self._registry['inspect_service'] = lambda: CachedFloatResolver(
+            InspectServiceFloatResolver(
+                os.getenv('inspect_service_url', 'http://127.0.0.1:80/'),
+                concurrency=int(os.getenv('inspect_service_concurrency', 10)),
+            )
+        )
+        self._registry['cache'] = lambda: CachedFloatResolver()
+
+    def create_resolver(self, resolver: str) -> FloatResolver:
+        return self._registry[resolver]()
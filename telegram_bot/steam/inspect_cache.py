@@ -0,0 +1,55 @@
+import logging
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from telegram_bot.db import db_query
+from telegram_bot.db.runtime import DB_RUNTIME
+from telegram_bot.resources.data_containers import ParamsSkinData, SkinDataSteam
+
+
+class InspectCache:
+    def __init__(self, async_session: async_sessionmaker | None = None, maxsize: int = 50000) -> None:
+        self._async_session = async_session
+        self._lru: LRUCache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _key(params: ParamsSkinData) -> Tuple[int, int]:
+        return int(params.param_a), int(params.param_d)
+
+    async def get_many(self, skins_params: Iterable[ParamsSkinData]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+        found = {}
+        missing = []
+        for params in skins_params:
+            key = self._key(params)
+            if (float_seed := self._lru.get(key)) is not None:
+                found[key] = float_seed
+            else:
+                missing.append(key)
+
+        if missing and self._async_session is not None:
+            stored = await db_query.get_steam_skins_inspect_data(self._async_session, missing)
+            self._lru.update(stored)
+            found.update(stored)
+        return found
+
+    def add(self, params: ParamsSkinData, steam_skin: SkinDataSteam) -> None:
+        self._lru[self._key(params)] = (steam_skin.skin_float, steam_skin.skin_seed)
+
+    async def save(
+            self, weapon: str, skin: str, quality: str, stattrak: bool,
+            skins_data: List[Tuple[ParamsSkinData, SkinDataSteam]]
+    ) -> None:
+        if not skins_data or self._async_session is None:
+            return
+        try:
+            await db_query.upsert_steam_skins_data(
+                self._async_session, weapon, skin, quality, stattrak, skins_data
+            )
+        except Exception:
+            logging.exception('Could not save %s inspected listings of %s | %s', len(skins_data), weapon, skin)
+
+
+INSPECT_CACHE = InspectCache(DB_RUNTIME.session_maker, maxsize=int(os.getenv('inspect_cache_size', 50000)))
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import gevent
+from csgo.client import CSGOClient
+from steam.client import SteamClient
+from steam.enums import EResult
+
+from telegram_bot.commands.bot_errors_command import TechError
+from telegram_bot.resources.data_containers import ParamsSkinData, SteamAccount
+
+
+def _set_future_result(future: asyncio.Future, result: Tuple[float, int] | None) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+class InspectWorker(threading.Thread):
+    """Owns one logged in Steam account and serves inspect requests from its own gevent hub."""
+
+    def __init__(self, account: SteamAccount, requests: queue.Queue, gc_timeout: float) -> None:
+        super().__init__(name=f'inspect-worker-{account.login}', daemon=True)
+        self.account = account
+        self._requests = requests
+        self._gc_timeout = gc_timeout
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        steam_client = SteamClient()
+        try:
+            result = steam_client.login(
+                self.account.login, self.account.password, two_factor_code=self.account.two_factor_code
+            )
+        except Exception:
+            logging.exception('Steam login failed for %s', self.account.login)
+            return
+        if result != EResult.OK:
+            logging.error('Steam login failed for %s: %r', self.account.login, result)
+            return
+
+        cs_game_coordinator = CSGOClient(steam_client)
+        try:
+            cs_game_coordinator.launch()
+            if cs_game_coordinator.wait_event('ready', timeout=self._gc_timeout) is None:
+                logging.error('CS game coordinator was not ready for %s', self.account.login)
+                return
+            while not self._stopped.is_set():
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    gevent.sleep(0.05)
+                    continue
+                self._inspect(cs_game_coordinator, *request)
+        finally:
+            cs_game_coordinator.exit()
+            steam_client.logout()
+
+    def _inspect(
+            self,
+            cs_game_coordinator: CSGOClient,
+            params: ParamsSkinData,
+            future: asyncio.Future,
+            loop: asyncio.AbstractEventLoop
+    ) -> None:
+        if future.done():
+            return
+        cs_game_coordinator.request_preview_data_block(
+            s=int(params.param_s),
+            a=int(params.param_a),
+            d=int(params.param_d),
+            m=int(params.param_m)
+        )
+        result = None
+        deadline = time.monotonic() + self._gc_timeout
+        while (timeout := deadline - time.monotonic()) > 0:
+            response = cs_game_coordinator.wait_event('item_data_block', timeout)
+            if response is None:
+                break
+            if response[0].itemid == int(params.param_a):
+                skin_float = struct.unpack('<f', struct.pack('<I', response[0].paintwear))
+                result = skin_float[0], response[0].paintseed
+                break
+        loop.call_soon_threadsafe(_set_future_result, future, result)
+
+
+class InspectWorkerPool:
+    def __init__(
+            self, accounts: List[SteamAccount], *, gc_timeout: float = 10, timeout: float = 60,
+            restart_delay: float = 60
+    ) -> None:
+        self.accounts = accounts
+        self.gc_timeout = gc_timeout
+        self.timeout = timeout
+        self.restart_delay = restart_delay
+        self._requests: queue.Queue = queue.Queue()
+        self._workers: Dict[SteamAccount, InspectWorker] = {}
+        self._started_at: Dict[SteamAccount, float] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if not self.accounts:
+            raise TechError('No Steam accounts configured, set steam_accounts to login:password[:two_factor_code],...')
+        with self._lock:
+            now = time.monotonic()
+            for account in self.accounts:
+                if (worker := self._workers.get(account)) is not None and worker.is_alive():
+                    continue
+                if worker is not None and now - self._started_at[account] < self.restart_delay:
+                    continue
+                worker = InspectWorker(account, self._requests, self.gc_timeout)
+                worker.start()
+                self._workers[account] = worker
+                self._started_at[account] = now
+
+    def stop(self) -> None:
+        with self._lock:
+            for worker in self._workers.values():
+                worker.stop()
+            self._workers = {}
+            self._started_at = {}
+
+    @property
+    def alive(self) -> int:
+        return sum(worker.is_alive() for worker in self._workers.values())
+
+    async def inspect(self, params: ParamsSkinData) -> Tuple[float, int] | None:
+        self.start()
+        if not self.alive:
+            logging.warning('No inspect worker is logged in, skipping asset %s', params.param_a)
+            return None
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((params, future, loop))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            logging.warning('Inspect request for asset %s timed out', params.param_a)
+            return None
+
+
+def _accounts_from_env() -> List[SteamAccount]:
+    if not (accounts := os.getenv('steam_accounts')):
+        return []
+    return [SteamAccount(*account.split(':')) for account in accounts.split(',')]
+
+
+INSPECT_POOL = InspectWorkerPool(
+    _accounts_from_env(),
+    gc_timeout=float(os.getenv('inspect_gc_timeout', 10)),
+    timeout=float(os.getenv('inspect_timeout', 60)),
+    restart_delay=float(os.getenv('inspect_restart_delay', 60)),
+)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Callable
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from telegram_bot.resources import parse_const, steam_const
+
+Condition = Callable[[WebDriver], Any]
+
+
+async def wait_until(driver: WebDriver, condition: Condition, timeout: float = 20, poll: float = 0.1) -> Any:
+    """Asyncio counterpart of WebDriverWait.until: each poll runs the WebDriver calls in a worker thread."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            if result := await asyncio.to_thread(condition, driver):
+                return result
+        except (NoSuchElementException, StaleElementReferenceException):
+            pass
+        if loop.time() >= deadline:
+            raise TimeoutException(f'Condition {getattr(condition, "__name__", condition)} timed out')
+        await asyncio.sleep(poll)
+
+
+def element_clickable(by: str, value: str) -> Condition:
+    def _element_clickable(driver: WebDriver) -> WebElement | bool:
+        element = driver.find_element(by, value)
+        return element if element.is_displayed() and element.is_enabled() else False
+    return _element_clickable
+
+
+def attribute_changed(element: WebElement, attribute: str, old_value: str | None) -> Condition:
+    def _attribute_changed(_: WebDriver) -> bool:
+        return element.get_attribute(attribute) != old_value
+    return _attribute_changed
+
+
+def float_checker_ready(driver: WebDriver) -> WebElement | None:
+    return driver.execute_script(parse_const.float_checker_select_menu)
+
+
+def listing_rows_loaded(driver: WebDriver) -> bool:
+    return driver.execute_script(steam_const.float_checker_rows_loaded)
+
+
+def active_page_changed(active_page: int | str) -> Condition:
+    def _active_page_changed(driver: WebDriver) -> bool:
+        results_links = driver.find_element(By.ID, 'searchResults_links')
+        return results_links.find_element(By.CLASS_NAME, 'active').text != str(active_page)
+    return _active_page_changed
+
+
+async def wait_optional(driver: WebDriver, condition: Condition, timeout: float) -> Any:
+    try:
+        return await wait_until(driver, condition, timeout)
+    except TimeoutException:
+        return None
@@ -1,39 +1,57 @@
 import asyncio
 import logging
-import struct
+import re
+from operator import attrgetter
 from typing import AsyncIterable, Tuple, List
 
-from csgo.client import CSGOClient
-from steam.client import SteamClient
-
 from telegram_bot.abc.url_constructors import URLConstructor
 from telegram_bot.commands.bot_errors_command import RequestError
 from telegram_bot.abc.providers import SteamSkinDataProvider
 from telegram_bot.resources.data_containers import SkinDataSteam, ParamsSkinData
 from telegram_bot.resources.misc import ClosableQueue
+from telegram_bot.abc.float_resolvers import FloatResolver
+from telegram_bot.steam.float_resolvers import CachedFloatResolver, GcPoolFloatResolver
 
 logging.basicConfig(format='[%(asctime)s] %(levelname)s %(name)s: %(message)s', level=logging.DEBUG)
 
 
+def parse_steam_price(price: str) -> float | None:
+    """Reads '$2.68 USD' as well as '2,68€': a trailing separator followed by one or two digits starts the cents."""
+    if (number := re.search(r'\d[\d.,\s]*', price)) is None:
+        return None
+    integer, fraction = re.sub(r'\s', '', number.group()).rstrip('.,'), '0'
+    if decimal := re.search(r'[.,](\d{1,2})$', integer):
+        integer, fraction = integer[:decimal.start()], decimal.group(1)
+    return float(f"{re.sub(r'[.,]', '', integer)}.{fraction}")
+
+
 class ApiSteamSkinDataProvider(SteamSkinDataProvider):
-    def __init__(self, url_const: URLConstructor, in_queue: ClosableQueue, out_queue: ClosableQueue):
+    inspect_batch_size = 10
+
+    def __init__(
+            self,
+            url_const: URLConstructor,
+            in_queue: ClosableQueue,
+            out_queue: ClosableQueue,
+            float_resolver: FloatResolver | None = None
+    ):
         self._url_constructor = url_const
         self.in_queue = in_queue
         self.out_queue = out_queue
-        self.steam_client = SteamClient()
-        self.steam_client.login('devsayder', 'rv9up0ax', two_factor_code='HF2KV')
-        self.cs_game_coordinator = CSGOClient(self.steam_client)
+        self._float_resolver = float_resolver or CachedFloatResolver(GcPoolFloatResolver())
 
     async def get_processed_data(self) -> None:
         try:
-            self.cs_game_coordinator.launch()
-            self.cs_game_coordinator.wait_event('ready', timeout=1)
             async for web_data in self.in_queue:
                 await self._data_worker(web_data)
         finally:
-            await self.out_queue.put(self.out_queue.SENTINEL)
-            self.cs_game_coordinator.exit()
-            self.steam_client.logout()
+            await self.out_queue.close()
+            await self._float_resolver.save(
+                self._url_constructor.weapon,
+                self._url_constructor.skin,
+                self._url_constructor.quality,
+                self._url_constructor.stattrak
+            )
 
     async def _data_worker(self, url_response: dict) -> None:
         if url_response is None:
@@ -41,27 +59,43 @@ class ApiSteamSkinDataProvider(SteamSkinDataProvider):
 
         listing = url_response['listinginfo']
 
-        async for data in self.__find_data(listing):
-            self.cs_game_coordinator.request_preview_data_block(
-                s=int(data.param_s),
-                a=int(data.param_a),
-                d=int(data.param_d),
-                m=int(data.param_m)
-            )
-            try:
-                response = self.cs_game_coordinator.wait_event('item_data_block', 10)
-
-                skin_float = struct.unpack('<f', struct.pack('<I', response[0].paintwear))
-                skin_seed = response[0].paintseed
+        skins_params = [
+            data async for data in self.__find_data(listing)
+            if self.price_ceiling is None or data.price <= self.price_ceiling
+        ]
+        if self.candidate_filter is not None:
+            await self._inspect_candidates(sorted(skins_params, key=attrgetter('price')))
+            return
+
+        resolved = await self._float_resolver.resolve_many(skins_params)
+
+        for data in skins_params:
+            if (float_seed := resolved.get(self._float_resolver.key(data))) is not None:
+                await self.out_queue.put(self._create_skin_data(data, float_seed))
+
+    async def _inspect_candidates(self, skins_params: List[ParamsSkinData]) -> None:
+        while skins_params:
+            price_ceiling = self.candidate_filter.price_ceiling
+            batch = [data for data in skins_params[:self.inspect_batch_size] if data.price <= price_ceiling]
+            if not batch:
+                return
+            skins_params = skins_params[self.inspect_batch_size:]
+
+            resolved = await self._float_resolver.resolve_many(batch)
+            for data in batch:
+                if (float_seed := resolved.get(self._float_resolver.key(data))) is not None:
+                    steam_skin = self._create_skin_data(data, float_seed)
+                    self.candidate_filter.match_skin(steam_skin)
+                    await self.out_queue.put(steam_skin)
 
-                await self.out_queue.put(SkinDataSteam(
-                    price=data.price,
-                    skin_float=skin_float[0],
-                    link=data.link_to_buy,
-                    skin_seed=skin_seed,
-                ))
-            except TypeError:
-                pass
+    @staticmethod
+    def _create_skin_data(data: ParamsSkinData, float_seed: Tuple[float, int]) -> SkinDataSteam:
+        return SkinDataSteam(
+            price=data.price,
+            skin_float=float_seed[0],
+            link=data.link_to_buy,
+            skin_seed=float_seed[1],
+        )
 
     @staticmethod
     async def __get_converted_price(converted_price_per_unit: str, converted_fee_per_unit: str) -> float:
@@ -125,17 +159,13 @@ class SeleniumSteamSkinDataProvider(SteamSkinDataProvider):
         self.in_queue = in_queue
         self.out_queue = out_queue
 
-    async def __work(self, url, float_data, price) -> None:
+    async def __work(self, url, float_seed, price) -> None:
         link_data = self._get_link_data(url)
         async with asyncio.TaskGroup() as tg:
             url = tg.create_task(self._create_skin_link_steam(*link_data))
 
-            float_seed = tg.create_task(self._get_skin_float_and_seed(float_data))
-
             skin_price = tg.create_task(self._get_skin_price(price))
 
-        float_seed = float_seed.result()
-
         await self.out_queue.put(SkinDataSteam(
             price=skin_price.result(),
             skin_float=float_seed[0],
@@ -144,11 +174,14 @@ class SeleniumSteamSkinDataProvider(SteamSkinDataProvider):
         ))
 
     async def _data_worker(self, url_response: dict) -> None:
-        float_data = url_response['skin_float']
         price = url_response['price']
         url = url_response['url']
+        if 'skin_seed' in url_response:
+            float_seed = url_response['skin_float'], url_response['skin_seed']
+        else:
+            float_seed = await self._get_skin_float_and_seed(url_response['skin_float'])
 
-        await self.__work(url, float_data, price)
+        await self.__work(url, float_seed, price)
 
     @staticmethod
     def _get_link_data(url: str) -> List[str]:
@@ -163,8 +196,6 @@ class SeleniumSteamSkinDataProvider(SteamSkinDataProvider):
 
     @staticmethod
     async def _get_skin_price(price: str) -> float | bool:
-        if price == 'sold':
+        if price == 'sold' or (value := parse_steam_price(price)) is None:
             return False
-        value = float(''.join(char for char in price.replace(',', '') if char.isdigit() or char == '.'))
-        print(value)
         return value
@@ -1,105 +1,107 @@
 from __future__ import annotations
 import asyncio
+import logging
+import math
+import os
+from collections import deque
+from typing import Callable, Deque, List
 
-from functools import wraps
-
-from aiohttp import ClientSession
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.common.by import By
-from selenium.webdriver.edge.service import Service as EdgeService
 
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
     NoSuchElementException,
-    ElementNotInteractableException
+    ElementNotInteractableException,
+    TimeoutException
 )
 from fake_useragent import UserAgent
+from yarl import URL
 
 from telegram_bot.abc.services import DataService
 from telegram_bot.abc.url_constructors import URLConstructor
 from telegram_bot.resources import parse_const, steam_const
-from telegram_bot.commands.bot_errors_command import InvalidWeapon, RequestError
+from telegram_bot.commands.bot_errors_command import InvalidWeapon, RequestError, TechError
+from telegram_bot.resources.http_client import HttpClient, HTTP_CLIENT
 from telegram_bot.resources.misc import ClosableQueue
+from telegram_bot.resources.proxy_pool import ProxyPool, STEAM_PROXY_POOL
+from telegram_bot.resources.rate_limiter import AdaptiveRateLimiter, RATE_LIMITER
+from telegram_bot.steam import page_waits
+from telegram_bot.steam.browser_pool import BrowserPool, BROWSER_POOL
+from telegram_bot.steam.providers import parse_steam_price
 
+StopCondition = Callable[[List[float]], bool]
 
-def sleep_page(_func=None, *, sec_before: int | float = None, sec_after: int | float = None):
-    def sleep_page_decorator(func):
-        @wraps(func)
-        async def wrapper_sleep(*args, **kwargs):
-            if sec_before:
-                await asyncio.sleep(sec_before)
-            await func(*args, **kwargs)
-            if sec_after:
-                await asyncio.sleep(sec_after)
-        return wrapper_sleep
-    if _func is None:
-        return sleep_page_decorator
-    else:
-        return sleep_page_decorator(_func)
+STEAM_MAX_PAGES = int(os.getenv('steam_max_pages', 10))
 
 
 class SeleniumSteamDataService(DataService):
-    def __init__(self, url_constructor: URLConstructor, queue: ClosableQueue) -> None:
+    rows_timeout = 20
+
+    def __init__(
+            self,
+            url_constructor: URLConstructor,
+            queue: ClosableQueue,
+            browser_pool: BrowserPool = BROWSER_POOL,
+            rate_limiter: AdaptiveRateLimiter = RATE_LIMITER,
+            *,
+            max_pages: int = STEAM_MAX_PAGES,
+            stop_condition: StopCondition | None = None
+    ) -> None:
         self.url_constructor = url_constructor
-        self.service = EdgeService(parse_const.driver_root_edge)
-        self.options = EdgeOptions()
-        for extension in parse_const.extensions:
-            self.options.add_extension(extension)
-        # self.options.add_argument(parse_const.headless_browser)
-        self.options.add_argument(f'user-agent={UserAgent.random}')
         self.queue = queue
+        self.max_pages = max_pages
+        self.stop_condition = stop_condition
+        self._browser_pool = browser_pool
+        self._rate_limiter = rate_limiter
         self._url = self.url_constructor.create_url()
+        self._host = URL(self._url).host
 
     async def add_web_data(self) -> None:
-        with webdriver.Edge(self.options, self.service) as self._driver:
-            await self._prep_vpn()
-            await self._steam_market_prep_page()
-            try:
+        try:
+            async with self._browser_pool.acquire() as self._driver:
+                await self._steam_market_prep_page()
                 while page := await self._current_page():
                     if page == 1:
                         await self._find_accept_button()
-                    await self._service_worker()
-                    if page == 3 or not await self._steam_market_next_page(page):
+                    prices = await self._service_worker()
+                    if self._is_last_page(page, prices) or not await self._steam_market_next_page(page):
                         break
-            finally:
-                await self.queue.put(self.queue.SENTINEL)
-
-    @sleep_page(sec_before=2, sec_after=2)
-    async def _prep_vpn(self) -> None:
-        self._driver.get('chrome-extension://adlpodnneegcnbophopdmhedicjbcgco/popup.html')
-        accept_button = self._driver.find_element(By.CLASS_NAME, 'analytics__button')
-        accept_button.click()
-        vpn_button = self._driver.find_element(By.CLASS_NAME, 'connect-button')
-        vpn_button.click()
-
-    async def _service_worker(self) -> None:
-
-        prices_from_page = (
-            item.text for item in self._driver.find_elements(By.CLASS_NAME, steam_const.get_price_for_item)
-        )
-        links_to_buy = (
-            item.get_attribute('href') for item in self._driver.find_elements(
-                By.CLASS_NAME, steam_const.get_link_for_item)
+        finally:
+            await self.queue.close()
+
+    def _is_last_page(self, page: int | str, prices: List[float]) -> bool:
+        if page == 'one_page' or page >= self.max_pages or self._past_price_ceiling(prices):
+            return True
+        return self.stop_condition is not None and self.stop_condition(prices)
+
+    async def _service_worker(self) -> List[float]:
+        records = self._driver.execute_script(steam_const.float_checker_page_records)
+        complete = [record for record in records if None not in record.values()]
+        if records and not complete:
+            raise TechError(f'None of {len(records)} listings on the page could be read')
+        if len(complete) < len(records):
+            logging.warning('Read %s of %s listings on %s', len(complete), len(records), self._url)
+
+        await self.queue.put_many(
+            {
+                'skin_float': record['float'],
+                'skin_seed': record['seed'],
+                'price': record['price'],
+                'url': record['href'],
+            } for record in complete
         )
-        skins_float = (
-            item.text for item in self._driver.execute_script(steam_const.float_checker_get_float)
-        )
-
-        for data in zip(skins_float, prices_from_page, links_to_buy):
-            await self.queue.put({
-                'skin_float': data[0],
-                'price': data[1],
-                'url': data[2],
-            })
+        return [
+            price for record in records
+            if record['price'] is not None and (price := parse_steam_price(record['price'])) is not None
+        ]
 
-    @sleep_page(sec_after=2)
     async def _steam_market_prep_page(self) -> None:
+        await self._rate_limiter.acquire(self._host)
         self._driver.get(self._url)
 
-        length_page_selector = self._driver.execute_script(
-            parse_const.float_checker_select_menu
-        )
+        await self._steam_market_has_exceptions()
+
+        length_page_selector = await page_waits.wait_until(self._driver, page_waits.float_checker_ready)
         length_page_selector.click()
 
         select_length = self._driver.execute_script(
@@ -108,12 +110,19 @@ class SeleniumSteamDataService(DataService):
         )
         select_length.click()
 
-        await self._steam_market_has_exceptions()
+        await self._wait_listing_rows()
+
+    async def _wait_listing_rows(self) -> None:
+        if await page_waits.wait_optional(self._driver, page_waits.listing_rows_loaded, self.rows_timeout) is None:
+            logging.warning('Float checker did not load every listing of %s, parsing the ready rows', self._url)
 
-    @sleep_page(sec_before=5)
     async def _find_accept_button(self) -> None:
+        accept_all_button = await page_waits.wait_optional(
+            self._driver, page_waits.element_clickable(By.ID, 'acceptAllButton'), timeout=5
+        )
+        if accept_all_button is None:
+            return
         try:
-            accept_all_button = self._driver.find_element(By.ID, 'acceptAllButton')
             accept_all_button.click()
         except (NoSuchElementException, ElementNotInteractableException):
             pass
@@ -124,6 +133,7 @@ class SeleniumSteamDataService(DataService):
             if error := self._driver.find_element(
                     By.CLASS_NAME, 'error_ctn'
             ).find_element(By.TAG_NAME, 'h3'):
+                self._rate_limiter.report(self._host, 200, error.text)
                 raise RequestError(error.text)
 
             if (error := self._driver.find_element(
@@ -132,7 +142,7 @@ class SeleniumSteamDataService(DataService):
                     By.CLASS_NAME, 'market_listing_table_message')):
                 raise InvalidWeapon(error.text)
         except NoSuchElementException:
-            return
+            self._rate_limiter.success(self._host)
 
     async def _steam_market_next_page(self, active_page: int) -> bool:
         if active_page == 'one_page':
@@ -140,17 +150,18 @@ class SeleniumSteamDataService(DataService):
         next_page = self._driver.find_element(By.ID, parse_const.button_for_next_page)
         if next_page.get_attribute('class') == 'pagebtn disabled':
             return False
-        second_limit = 0
-
-        while await self._current_page() == active_page:
-            try:
-                next_page.click()
-            except (ElementNotInteractableException, ElementClickInterceptedException):
-                return False
-            await asyncio.sleep(2)
-            second_limit += 2
-            if second_limit > 20:
-                return False
+
+        await self._rate_limiter.acquire(self._host)
+        try:
+            next_page.click()
+        except (ElementNotInteractableException, ElementClickInterceptedException):
+            return False
+
+        try:
+            await page_waits.wait_until(self._driver, page_waits.active_page_changed(active_page))
+        except TimeoutException:
+            return False
+        await self._wait_listing_rows()
         return True
 
     async def _current_page(self) -> str | int:
@@ -164,25 +175,66 @@ class SeleniumSteamDataService(DataService):
 
 
 class ApiSteamDataService(DataService):
-    def __init__(self, url_constructor: URLConstructor, queue: ClosableQueue):
+    page_size = 100
+
+    def __init__(
+            self,
+            url_constructor: URLConstructor,
+            queue: ClosableQueue,
+            http_client: HttpClient = HTTP_CLIENT,
+            proxy_pool: ProxyPool = STEAM_PROXY_POOL,
+            *,
+            max_pages: int = STEAM_MAX_PAGES,
+            prefetch: int = 4,
+            stop_condition: StopCondition | None = None
+    ):
         self._url_constructor = url_constructor
         self.queue = queue
+        self._http_client = http_client
+        self._proxy_pool = proxy_pool
+        self.max_pages = max_pages
+        self.prefetch = max(prefetch, 1)
+        self.stop_condition = stop_condition
 
     async def add_web_data(self) -> None:
-        page_number = 1
-        start = 0
-        count = 100
-        tasks = []
-        async with ClientSession() as session:
-            while page_number <= 3:
-                self._url_constructor.start, self._url_constructor.offset = start, count
-                url = self._url_constructor.create_url()
-                tasks.append(asyncio.create_task(session.get(
-                    url, headers={'user-agent': f'{UserAgent.random}'}, proxy='http://51.38.191.151:80'))
-                )
-                start += count
-                page_number += 1
-            responses = await asyncio.gather(*tasks)
-            for resp in responses:
-                await self.queue.put(await resp.json(content_type=None))
-        await self.queue.put(self.queue.SENTINEL)
+        pages: Deque[asyncio.Task] = deque()
+        try:
+            web_data = await self._get_page(self._page_url(0))
+            await self.queue.put(web_data)
+            if web_data is None or self._should_stop(web_data):
+                return
+
+            total_pages = min(self.max_pages, math.ceil(web_data.get('total_count', 0) / self.page_size))
+            next_page = 1
+            while True:
+                while len(pages) < self.prefetch and next_page < total_pages:
+                    pages.append(asyncio.create_task(self._get_page(self._page_url(next_page * self.page_size))))
+                    next_page += 1
+                if not pages:
+                    break
+                web_data = await pages.popleft()
+                await self.queue.put(web_data)
+                if web_data is None or self._should_stop(web_data):
+                    break
+        finally:
+            for page in pages:
+                page.cancel()
+            await self.queue.close()
+
+    def _page_url(self, start: int) -> str:
+        self._url_constructor.start, self._url_constructor.offset = start, self.page_size
+        return self._url_constructor.create_url()
+
+    def _should_stop(self, web_data: dict) -> bool:
+        prices = [
+            (listing['converted_price_per_unit'] + listing['converted_fee_per_unit']) / 100
+            for listing in (web_data.get('listinginfo') or {}).values()
+            if 'converted_price_per_unit' in listing
+        ]
+        return self._past_price_ceiling(prices) or self.stop_condition is not None and self.stop_condition(prices)
+
+    async def _get_page(self, url: str) -> dict:
+        async with self._http_client.get(
+                url, headers={'user-agent': f'{UserAgent.random}'}, proxy_pool=self._proxy_pool
+        ) as response:
+            return await response.json(content_type=None)
@@ -0,0 +1,55 @@
+import pytest
+
+from telegram_bot.db import db_query
+from telegram_bot.db.catalog import SkinCatalog
+from telegram_bot.resources.data_containers import SkinDataSteam
+
+
+def create_catalog() -> SkinCatalog:
+    catalog = SkinCatalog()
+    catalog.weapons = {'USP-S': 1, 'Desert Eagle': 2}
+    catalog.skins = {'Cortex': 1, 'Code Red': 2}
+    catalog.qualities = {'Factory New': 1, 'Well-Worn': 2}
+    catalog.stattraks = {False: 1, True: 2}
+    catalog.skin_weapons = {(1, 1), (2, 2)}
+    catalog.skin_qualities = {(1, 1), (2, 2)}
+    catalog.skin_stattraks = {(1, 1), (2, 2)}
+    catalog.variants = {(1, 1, 1, 1): 1, (2, 2, 2, 2): 2}
+    catalog.loaded = True
+    return catalog
+
+
+def test_catalog_should_answer_skin_exists_from_variants():
+    catalog = create_catalog()
+    assert catalog.contains('USP-S', 'Cortex', 'Factory New', False)
+    assert catalog.contains('Desert Eagle', 'Code Red', 'Well-Worn', True)
+    assert not catalog.contains('USP-S', 'Cortex', 'Well-Worn', False)
+    assert not catalog.contains('Desert Eagle', 'Cortex', 'Factory New', False)
+    assert not catalog.contains('AK-47', 'Asiimov', 'Field-Tested', False)
+
+
+def test_catalog_should_pick_random_variant_by_name():
+    catalog = create_catalog()
+    picks = {catalog.random_variant() for _ in range(50)}
+    assert picks == {('USP-S', 'Cortex', 'Factory New', False), ('Desert Eagle', 'Code Red', 'Well-Worn', True)}
+    catalog.variants = {}
+    assert catalog.random_variant() is None
+
+
+def test_catalog_should_map_names_to_ids_and_invalidate():
+    catalog = create_catalog()
+    assert catalog.ids('Desert Eagle', 'Code Red', 'Battle-Scarred', True) == (2, 2, None, 2)
+    catalog.invalidate()
+    assert not catalog.loaded and catalog.skins == {}
+
+
+@pytest.mark.asyncio
+async def test_listing_observations_should_skip_unknown_skins():
+    def session_maker():
+        raise AssertionError('unknown skins must not reach the database')
+
+    await db_query.add_listing_observations(
+        session_maker, 'AK-47', 'Asiimov', 'Field-Tested', False, 'steam',
+        [SkinDataSteam(price=10, skin_float=0.25, link='link_0', skin_seed=1)],
+        catalog=create_catalog()
+    )
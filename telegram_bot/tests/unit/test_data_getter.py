@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.resources.data_containers import SkinDataCsm, SkinDataSteam
+from telegram_bot.resources.listing_recorder import ListingRecorder
+from telegram_bot.resources.matching_data_getter import MatchingDataGetter
+from telegram_bot.resources.matching_engines import Matcher
+from telegram_bot.resources.parser_factory import ParserInterface
+from telegram_bot.steam.url_constructors import SkinSteamUrl
+
+
+class ListDataService:
+    def __init__(self, data, queue, delay=0.0):
+        self.data = data
+        self.queue = queue
+        self.delay = delay
+
+    async def add_web_data(self):
+        for item in self.data:
+            await asyncio.sleep(self.delay)
+            await self.queue.put(item)
+        await self.queue.close()
+
+
+class ForwardDataProvider:
+    def __init__(self, in_queue, out_queue):
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+
+    async def get_processed_data(self):
+        async for item in self.in_queue:
+            await self.out_queue.put(item)
+        await self.out_queue.close()
+
+
+class ClosingDataService(ListDataService):
+    async def add_web_data(self):
+        try:
+            for item in self.data:
+                await self.queue.put(item)
+        finally:
+            await self.queue.close()
+
+
+class ClosingDataProvider(ForwardDataProvider):
+    async def get_processed_data(self):
+        try:
+            async for item in self.in_queue:
+                await self.out_queue.put(item)
+        finally:
+            await self.out_queue.close()
+
+
+class ListParser(ParserInterface):
+    def __init__(self, data, delay=0.0):
+        super().__init__()
+        self._web = ListDataService(data, self.service_queue, delay)
+        self._provider = ForwardDataProvider(self.service_queue, self.done_queue)
+
+
+class SmallQueueListParser(ListParser):
+    queue_size = 2
+
+
+class ClosingListParser(SmallQueueListParser):
+    def __init__(self, data):
+        super().__init__(data)
+        self._web = ClosingDataService(data, self.service_queue)
+        self._provider = ClosingDataProvider(self.service_queue, self.done_queue)
+
+
+class ListMatchingDataGetter(MatchingDataGetter):
+    def __init__(self, csm_data, steam_data, **kwargs):
+        super().__init__('Desert Eagle', 'Code Red', 'Battle-Scarred', False, **kwargs)
+        self.csm_parser = ListParser(csm_data)
+        self.steam_parser = ListParser(steam_data, delay=0.01)
+
+    async def factory_method(self):
+        return self.csm_parser, self.steam_parser, Matcher().create_engine(self.engine)
+
+
+csm_data = [
+    SkinDataCsm(name='Desert Eagle | Code Red', skin_float=0.41, price=20, price_with_float=21, overpay_float=1),
+    SkinDataCsm(name='Desert Eagle | Code Red', skin_float=0.52, price=30, price_with_float=31, overpay_float=1),
+]
+
+steam_data = [
+    SkinDataSteam(price=10, skin_float=0.4102, link='link_0', skin_seed=1),
+    SkinDataSteam(price=10, skin_float=0.7, link='link_1', skin_seed=2),
+    SkinDataSteam(price=10, skin_float=0.5199, link='link_2', skin_seed=3),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('concurrent', [False, True])
+async def test_should_match_data_in_both_modes(concurrent):
+    getter = ListMatchingDataGetter(csm_data, steam_data, concurrent=concurrent)
+    result = [skin async for skin in getter.compare_all_data()]
+    assert [(skin['steam_skin'].link, skin['csm_skin'].price) for skin in result] == [
+        ('link_0', 20), ('link_2', 30)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_should_stop_steam_parser_without_csm_data():
+    getter = ListMatchingDataGetter([], steam_data, concurrent=True)
+    getter.steam_parser = ClosingListParser(steam_data * 200)
+    result = [skin async for skin in getter.compare_all_data()]
+    assert result == []
+    assert getter.steam_parser.done_queue.metrics.items_in < len(steam_data * 200)
+    assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+
+@pytest.mark.asyncio
+async def test_parser_stream_should_yield_items_before_parser_finishes():
+    parser = SmallQueueListParser(list(range(50)))
+    result = []
+    async for item in parser.stream():
+        assert parser.done_queue.qsize() <= 2
+        assert not parser._collect_task.done() or item >= 45
+        result.append(item)
+    assert result == list(range(50))
+
+
+class FailingDataProvider(ForwardDataProvider):
+    async def get_processed_data(self):
+        await self.in_queue.get()
+        raise ValueError
+
+
+class FailingProviderParser(SmallQueueListParser):
+    def __init__(self, data, web_class):
+        super().__init__(data)
+        self._web = web_class(data, self.service_queue)
+        self._provider = FailingDataProvider(self.service_queue, self.done_queue)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('web_class', [ListDataService, ClosingDataService])
+async def test_parser_stream_should_cancel_web_service_when_provider_fails(web_class):
+    parser = FailingProviderParser(list(range(50)), web_class)
+    with pytest.raises(ValueError):
+        await parser.run()
+    assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+
+@pytest.mark.asyncio
+async def test_parser_stream_should_finish_stages_when_consumer_stops_early():
+    parser = ClosingListParser(list(range(600)))
+    stream = parser.stream()
+    assert [await anext(stream) for _ in range(5)] == list(range(5))
+    await stream.aclose()
+    assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+
+class FakeRecorder(ListingRecorder):
+    def __init__(self):
+        super().__init__()
+        self.recorded = []
+
+    def record(self, weapon, skin, quality, stattrak, source, listings):
+        self.recorded.append((weapon, skin, source, list(listings)))
+
+
+class RecordedListParser(ListParser):
+    source = 'steam'
+
+    def __init__(self, data, recorder):
+        ParserInterface.__init__(self, recorder)
+        self._url_constructor = SkinSteamUrl('Desert Eagle', 'Code Red', 'Battle-Scarred', False)
+        self._web = ListDataService(data, self.service_queue, 0)
+        self._provider = ForwardDataProvider(self.service_queue, self.done_queue)
+
+
+@pytest.mark.asyncio
+async def test_parser_stream_should_record_observed_listings():
+    recorder = FakeRecorder()
+    parser = RecordedListParser(steam_data, recorder)
+    assert await parser.run() == steam_data
+    assert recorder.recorded == [('Desert Eagle', 'Code Red', 'steam', steam_data)]
+
+
+@pytest.mark.asyncio
+async def test_parser_stream_should_record_observed_listings_in_batches():
+    recorder = FakeRecorder()
+    parser = RecordedListParser(steam_data * 50, recorder)
+    parser.record_batch_size = 40
+    assert await parser.run() == steam_data * 50
+    assert [len(listings) for *_, listings in recorder.recorded] == [40, 40, 40, 30]
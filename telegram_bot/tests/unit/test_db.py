@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from telegram_bot.db.base import proceed_schemas, get_session_maker, drop_all_tables
 from telegram_bot.db import db_query
+from telegram_bot.resources.data_containers import ParamsSkinData, SkinDataSteam
 
 pytestmark = pytest.mark.asyncio
 
@@ -122,6 +123,62 @@ async def test_db_check_if_skin_exists(weapon_data, result, session_maker):
     assert data == result
 
 
+async def test_should_upsert_steam_skins_data_in_bulk(session_maker):
+    skins_data = [
+        (
+            ParamsSkinData(f'link_{index}', 2.5, 0, 76561198000000000, 1000 + index, 30000000000 + index),
+            SkinDataSteam(price=2.5, skin_float=0.2 + index / 1000, link=f'link_{index}', skin_seed=index)
+        ) for index in range(300)
+    ]
+    await db_query.upsert_steam_skins_data(session_maker, 'USP-S', 'Cortex', 'Factory New', False, skins_data)
+    params, steam_skin = skins_data[0]
+    await db_query.upsert_steam_skins_data(
+        session_maker, 'USP-S', 'Cortex', 'Factory New', False, [(params, steam_skin._replace(skin_seed=999))]
+    )
+    data = await db_query.get_steam_skins_inspect_data(
+        session_maker, [(params.param_a, params.param_d) for params, _ in skins_data]
+    )
+    assert len(data) == 300
+    assert data[(params.param_a, params.param_d)] == (steam_skin.skin_float, 999)
+
+
+async def test_should_upsert_relisted_steam_skin_by_param_d(session_maker):
+    params = ParamsSkinData('relist_0', 2.5, 0, 76561198000000000, 2000, 40000000000)
+    steam_skin = SkinDataSteam(price=2.5, skin_float=0.2, link='relist_0', skin_seed=1)
+    await db_query.upsert_steam_skins_data(
+        session_maker, 'USP-S', 'Cortex', 'Factory New', False, [(params, steam_skin)]
+    )
+    relisted = params._replace(link_to_buy='relist_1', param_a=40000000001)
+    await db_query.upsert_steam_skins_data(
+        session_maker, 'USP-S', 'Cortex', 'Factory New', False,
+        [(relisted, steam_skin._replace(price=3.0, link='relist_1'))]
+    )
+    data = await db_query.get_steam_skins_inspect_data(
+        session_maker, [(40000000000, 2000), (40000000001, 2000)]
+    )
+    assert data == {(40000000001, 2000): (0.2, 1)}
+
+
+async def test_should_give_median_listing_price_for_float_bucket(session_maker):
+    listings = [
+        SkinDataSteam(price=price, skin_float=skin_float, link=f'link_{index}', skin_seed=index)
+        for index, (price, skin_float) in enumerate([(10, 0.251), (12, 0.254), (20, 0.249), (99, 0.61)])
+    ]
+    await db_query.add_listing_observations(
+        session_maker, 'USP-S', 'Cortex', 'Factory New', False, 'steam', listings
+    )
+    median = await db_query.get_median_listing_price(
+        session_maker, 'USP-S', 'Cortex', 'Factory New', False, 0.25, hours=1
+    )
+    assert median == 12
+
+
+async def test_should_give_random_weapon_from_skin_variants(session_maker):
+    data = await db_query.get_random_weapon_from_db(session_maker)
+    assert data is not None
+    assert await db_query.is_skin_exists(session_maker, *data)
+
+
 async def test_should_give_all_users(session_maker):
     for user in await db_query.get_users(session_maker):
         assert user.user_id == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from telegram_bot.abc.float_resolvers import FloatResolver
+from telegram_bot.commands.bot_errors_command import TechError
+from telegram_bot.resources.data_containers import ParamsSkinData, SkinDataSteam
+from telegram_bot.steam.float_resolvers import CachedFloatResolver
+from telegram_bot.steam.inspect_cache import InspectCache
+from telegram_bot.steam.inspect_workers import InspectWorkerPool
+
+
+class FakeBackend(FloatResolver):
+    def __init__(self, floats: dict):
+        self.floats = floats
+        self.calls = []
+
+    async def resolve(self, params):
+        self.calls.append(int(params.param_a))
+        return self.floats.get(int(params.param_a))
+
+
+class FakeInspectCache(InspectCache):
+    def __init__(self):
+        super().__init__(async_session=None)
+        self.saved = []
+
+    async def save(self, weapon, skin, quality, stattrak, skins_data):
+        self.saved.extend(skins_data)
+
+
+def make_params(asset_id: int) -> ParamsSkinData:
+    return ParamsSkinData(f'link_{asset_id}', 1.5, 0, 1, 100 + asset_id, asset_id)
+
+
+@pytest.mark.asyncio
+async def test_cached_resolver_sends_only_misses_to_backend():
+    backend = FakeBackend({1: (0.11, 5), 2: (0.22, 6)})
+    cache = FakeInspectCache()
+    resolver = CachedFloatResolver(backend, cache)
+
+    first = await resolver.resolve_many([make_params(1), make_params(2), make_params(3)])
+    second = await resolver.resolve_many([make_params(1), make_params(2)])
+    await resolver.save('USP-S', 'Cortex', 'Field-Tested', False)
+
+    assert first == second == {(1, 101): (0.11, 5), (2, 102): (0.22, 6)}
+    assert backend.calls == [1, 2, 3]
+    assert [params.param_a for params, _ in cache.saved] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cache_only_resolver_never_inspects():
+    resolver = CachedFloatResolver(inspect_cache=FakeInspectCache())
+    assert await resolver.resolve(make_params(1)) is None
+
+
+@pytest.mark.asyncio
+async def test_inspect_pool_without_accounts_should_raise():
+    with pytest.raises(TechError):
+        await InspectWorkerPool([]).inspect(make_params(1))
+
+
+@pytest.mark.asyncio
+async def test_inspect_cache_save_should_not_raise_on_db_errors():
+    def broken_session():
+        raise ConnectionError
+
+    await InspectCache(async_session=broken_session).save(
+        'USP-S', 'Cortex', 'Factory New', False,
+        [(make_params(1), SkinDataSteam(price=1.5, skin_float=0.2, link='link_1', skin_seed=1))]
+    )
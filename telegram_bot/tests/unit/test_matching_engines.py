@@ -0,0 +1,139 @@
+import os
+import random
+import time
+
+import pytest
+
+from telegram_bot.abc.matching_engines import float_bucket
+from telegram_bot.resources.data_containers import SkinDataCsm, SkinDataSteam
+from telegram_bot.resources.matching_engines import Matcher
+
+
+def create_csm_skins(floats, prices):
+    return sorted(
+        SkinDataCsm(
+            name='Desert Eagle | Code Red',
+            skin_float=skin_float,
+            price=price,
+            price_with_float=price + 1,
+            overpay_float=1
+        ) for skin_float, price in zip(floats, prices)
+    )
+
+
+def create_steam_skins(floats, prices):
+    return [
+        SkinDataSteam(price=price, skin_float=skin_float, link=f'link_{index}', skin_seed=index)
+        for index, (skin_float, price) in enumerate(zip(floats, prices))
+    ]
+
+
+async def collect_matches(engine_name, csm_skins, steam_skins):
+    engine = Matcher().create_engine(engine_name)
+    engine.load(list(csm_skins))
+    return [skin async for skin in engine.match(steam_skins)]
+
+
+@pytest.mark.asyncio
+async def test_sort_sweep_engine_should_match_like_gather_engine():
+    rnd = random.Random(7)
+    csm_skins = create_csm_skins([round(0.1 + index / 100, 2) for index in range(60)], [30] * 60)
+    steam_skins = create_steam_skins(
+        [rnd.uniform(0.1, 0.7) for _ in range(300)], [rnd.uniform(15, 35) for _ in range(300)]
+    )
+
+    gather_result = await collect_matches('gather', csm_skins, steam_skins)
+    sort_sweep_result = await collect_matches('sort_sweep', csm_skins, steam_skins)
+
+    assert gather_result
+    assert sort_sweep_result == gather_result
+
+
+@pytest.mark.asyncio
+async def test_sort_sweep_engine_should_match_repeated_buckets_like_gather_engine():
+    rnd = random.Random(11)
+    csm_skins = create_csm_skins(
+        [round(rnd.choice((0.15, 0.16, 0.17)) + rnd.uniform(0, 0.009), 4) for _ in range(40)],
+        [rnd.choice((20, 25, 30, 35)) for _ in range(40)]
+    )
+    steam_skins = create_steam_skins(
+        [rnd.uniform(0.15, 0.18) for _ in range(200)], [rnd.uniform(15, 35) for _ in range(200)]
+    )
+
+    gather_result = await collect_matches('gather', csm_skins, steam_skins)
+    sort_sweep_result = await collect_matches('sort_sweep', csm_skins, steam_skins)
+    numpy_result = await collect_matches('numpy', csm_skins, steam_skins)
+
+    assert len({float_bucket(skin['csm_skin'].skin_float) for skin in gather_result}) < len(gather_result)
+    assert sort_sweep_result == gather_result
+    assert numpy_result == gather_result
+
+
+@pytest.mark.asyncio
+async def test_sort_sweep_engine_should_pick_best_percent_and_use_up_beaten_skins():
+    csm_skins = create_csm_skins([0.251, 0.252, 0.253, 0.254, 0.61], [40, 60, 20, 50, 10])
+    steam_skins = create_steam_skins([0.2512, 0.2499, 0.2501, 0.61], [30, 30, 10, 30])
+
+    result = await collect_matches('sort_sweep', csm_skins, steam_skins)
+
+    assert [(skin['steam_skin'].link, skin['csm_skin'].price, skin['percent']) for skin in result] == [
+        ('link_0', 60, 51.0),
+        ('link_2', 20, 53.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_price_ceiling_should_bound_every_possible_match():
+    csm_skins = create_csm_skins([0.25, 0.61], [99, 49])
+    engine = Matcher().create_engine('sort_sweep')
+    engine.load(csm_skins)
+    assert engine.price_ceiling == pytest.approx(86)
+
+    below, above = create_steam_skins([0.25, 0.25], [85.99, 86.01])
+    assert (await collect_matches('sort_sweep', csm_skins, [below]))[0]['percent'] == 15
+    assert await collect_matches('sort_sweep', csm_skins, [above]) == []
+
+
+async def stream_skins(steam_skins):
+    for steam_skin in steam_skins:
+        yield steam_skin
+
+
+@pytest.mark.asyncio
+async def test_numpy_engine_should_match_like_sort_sweep_engine():
+    rnd = random.Random(3)
+    csm_skins = create_csm_skins(
+        [rnd.uniform(0.15, 0.25) for _ in range(200)], [rnd.choice((20, 25, 30, 35)) for _ in range(200)]
+    )
+    steam_skins = create_steam_skins(
+        [rnd.uniform(0.15, 0.25) for _ in range(300)], [rnd.uniform(15, 40) for _ in range(300)]
+    )
+
+    sort_sweep_result = await collect_matches('sort_sweep', csm_skins, steam_skins)
+    numpy_result = await collect_matches('numpy', csm_skins, steam_skins)
+    numpy_stream_result = await collect_matches('numpy', csm_skins, stream_skins(steam_skins))
+
+    assert sort_sweep_result
+    assert numpy_result == sort_sweep_result
+    assert numpy_stream_result == sort_sweep_result
+
+
+@pytest.mark.skipif(not os.getenv('run_benchmarks'), reason='set run_benchmarks to time the matching engines')
+@pytest.mark.asyncio
+async def test_benchmark_sort_sweep_engine_against_gather_engine():
+    rnd = random.Random(42)
+    csm_skins = create_csm_skins(
+        [rnd.uniform(0.15, 0.38) for _ in range(300)], [rnd.uniform(20, 40) for _ in range(300)]
+    )
+    steam_skins = create_steam_skins(
+        [rnd.uniform(0.15, 0.38) for _ in range(300)], [rnd.uniform(15, 45) for _ in range(300)]
+    )
+
+    elapsed = {}
+    for engine_name in ('gather', 'sort_sweep', 'numpy'):
+        start = time.perf_counter()
+        await collect_matches(engine_name, csm_skins, steam_skins)
+        elapsed[engine_name] = time.perf_counter() - start
+
+    assert elapsed['sort_sweep'] < elapsed['gather']
+    assert elapsed['numpy'] < elapsed['gather']
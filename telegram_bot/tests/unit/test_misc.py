@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.resources.misc import ClosableQueue
+
+
+@pytest.mark.asyncio
+async def test_queue_should_stream_until_closed_once():
+    queue = ClosableQueue(maxsize=2)
+
+    async def producer():
+        await queue.put_many(range(5))
+        await queue.close()
+        await queue.close()
+
+    async def consumer():
+        return [item async for item in queue]
+
+    _, result = await asyncio.gather(producer(), consumer())
+    assert result == list(range(5))
+    assert queue.empty()
+    assert queue.metrics.items_in == queue.metrics.items_out == 5
+    assert queue.metrics.max_depth <= 2
+
+
+@pytest.mark.asyncio
+async def test_queue_should_close_after_all_producers():
+    queue = ClosableQueue(maxsize=2, producers=3)
+
+    async def producer(start: int):
+        await queue.put_many(range(start, start + 5))
+        await queue.close(start)
+        await queue.close(start)
+
+    async def consumer():
+        return [item async for item in queue]
+
+    *_, result = await asyncio.gather(producer(0), producer(10), producer(20), consumer())
+    assert sorted(result) == [*range(0, 5), *range(10, 15), *range(20, 25)]
+    assert queue.empty()
+    assert queue.metrics.items_in == queue.metrics.items_out == 15
+    assert queue.metrics.max_depth <= 2
+
+
+@pytest.mark.asyncio
+async def test_queue_should_get_batches_until_closed():
+    queue = ClosableQueue()
+    await queue.put_many(range(7))
+    await queue.close()
+
+    assert await queue.get_batch(3) == [0, 1, 2]
+    assert await queue.get_batch(3) == [3, 4, 5]
+    assert await queue.get_batch(3) == [6]
+    assert await queue.get_batch(3) == []
+    assert queue.metrics.depth == 0
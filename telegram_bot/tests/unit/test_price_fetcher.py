@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.commands.bot_errors_command import RequestError
+from telegram_bot.csm.price_fetcher import CsmPriceFetcher
+
+
+@pytest.mark.asyncio
+async def test_should_coalesce_and_cache_same_asset_prices():
+    calls = []
+
+    async def request(url: str) -> dict:
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {'defaultPrice': 10}
+
+    price_fetcher = CsmPriceFetcher(concurrency=2)
+    result = await asyncio.gather(*(price_fetcher.fetch(asset_id % 3, f'url_{asset_id % 3}', request)
+                                     for asset_id in range(30)))
+    await price_fetcher.fetch(1, 'url_1', request)
+
+    assert result == [{'defaultPrice': 10}] * 30
+    assert sorted(calls) == ['url_0', 'url_1', 'url_2']
+
+
+@pytest.mark.asyncio
+async def test_should_retry_failed_price_requests():
+    responses = [RequestError, RequestError, {'defaultPrice': 5}]
+
+    async def request(url: str) -> dict:
+        response = responses.pop(0)
+        if response is RequestError:
+            raise RequestError
+        return response
+
+    price_fetcher = CsmPriceFetcher(retries=2, backoff=0.001, cache_ttl=0)
+    assert await price_fetcher.fetch(1, 'url', request) == {'defaultPrice': 5}
+    assert not responses
+
+
+@pytest.mark.asyncio
+async def test_follower_should_fetch_itself_when_leader_is_cancelled():
+    calls = []
+
+    async def request(url: str) -> dict:
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {'defaultPrice': 7}
+
+    price_fetcher = CsmPriceFetcher(cache_ttl=0)
+    leader = asyncio.create_task(price_fetcher.fetch(1, 'url', request))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(price_fetcher.fetch(1, 'url', request))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {'defaultPrice': 7}
+    assert leader.cancelled()
+    assert calls == ['url', 'url']
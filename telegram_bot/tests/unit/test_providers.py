@@ -1,7 +1,13 @@
 import pytest
 
-from telegram_bot.steam.providers import SeleniumSteamSkinDataProvider
-from telegram_bot.steam.url_constructors import SkinSteamUrl
+from telegram_bot.abc.float_resolvers import FloatResolver
+from telegram_bot.commands.bot_errors_command import InvalidName
+from telegram_bot.csm.providers import CSMWikiDataProvider
+from telegram_bot.resources.data_containers import SkinDataCsm
+from telegram_bot.resources.matching_engines import CandidateFilter, Matcher
+from telegram_bot.resources.misc import ClosableQueue
+from telegram_bot.steam.providers import ApiSteamSkinDataProvider, SeleniumSteamSkinDataProvider, parse_steam_price
+from telegram_bot.steam.url_constructors import SkinSteamApiUrl, SkinSteamUrl
 from telegram_bot.tests.fixtures import queue
 
 
@@ -18,3 +24,124 @@ async def test_should_handle_data_from_provider(queue):
     await provider.get_processed_data()
     print(out_queue)
 
+
+
+@pytest.mark.asyncio
+async def test_should_handle_extracted_page_records():
+    url_constructor = SkinSteamUrl(weapon='USP-S', skin='Cortex', quality='Field-Tested', stattrak=False)
+    in_queue, out_queue = ClosableQueue(), ClosableQueue()
+    await in_queue.put(
+        {'skin_float': 0.29906722903252, 'skin_seed': 541, 'price': '$2.68 USD', 'url': "javascript:BuyMarketListing('listing', '4455809658061103818', 730, '2', '34419661936')"}
+    )
+    await in_queue.close()
+    provider = SeleniumSteamSkinDataProvider(url_constructor, in_queue, out_queue)
+    await provider.get_processed_data()
+    skins = [skin async for skin in out_queue]
+    assert [(skin.skin_float, skin.skin_seed, skin.price) for skin in skins] == [(0.29906722903252, 541, 2.68)]
+
+
+class FakeFloatResolver(FloatResolver):
+    def __init__(self, floats: dict):
+        self.floats = floats
+        self.inspected = []
+
+    async def resolve(self, params):
+        self.inspected.append(int(params.param_a))
+        return self.floats[int(params.param_a)], 1
+
+
+def create_render_page(prices: list) -> dict:
+    return {'listinginfo': {
+        str(index): {
+            'listingid': str(index),
+            'asset': {
+                'appid': 730,
+                'contextid': '2',
+                'id': str(index),
+                'market_actions': [{
+                    'link': 'steam://rungame/730/76561202255233023/+csgo_econ_action_preview%20M%listingid%A%assetid%D7'
+                }],
+            },
+            'converted_price_per_unit': price * 100,
+            'converted_fee_per_unit': 0,
+        } for index, price in enumerate(prices)
+    }}
+
+
+async def match_render_page(csm_skins, prices, floats, candidate_filter):
+    url_constructor = SkinSteamApiUrl(weapon='Desert Eagle', skin='Code Red', quality='Battle-Scarred', stattrak=False)
+    in_queue, out_queue = ClosableQueue(), ClosableQueue()
+    resolver = FakeFloatResolver(floats)
+    provider = ApiSteamSkinDataProvider(url_constructor, in_queue, out_queue, resolver)
+    if candidate_filter:
+        provider.candidate_filter = CandidateFilter()
+        provider.candidate_filter.load(csm_skins)
+        provider.inspect_batch_size = 2
+    await in_queue.put(create_render_page(prices))
+    await in_queue.close()
+    await provider.get_processed_data()
+
+    engine = Matcher().create_engine('sort_sweep')
+    engine.load(csm_skins)
+    matches = [(skin['steam_skin'].price, skin['csm_skin'].skin_float) async for skin in engine.match(out_queue)]
+    return matches, resolver.inspected
+
+
+@pytest.mark.asyncio
+async def test_candidate_filter_should_skip_inspections_that_cannot_match():
+    csm_skins = [
+        SkinDataCsm(name='Desert Eagle | Code Red', skin_float=0.25, price=20, price_with_float=21, overpay_float=1),
+        SkinDataCsm(name='Desert Eagle | Code Red', skin_float=0.61, price=30, price_with_float=31, overpay_float=1),
+    ]
+    prices = [40, 10, 12, 26, 20, 30, 35, 27, 14]
+    floats = {index: skin_float for index, skin_float in enumerate([0.61, 0.25, 0.61, 0.25, 0.25, 0.61, 0.9, 0.1, 0.3])}
+
+    expected, all_inspected = await match_render_page(csm_skins, prices, floats, candidate_filter=False)
+    matches, inspected = await match_render_page(csm_skins, prices, floats, candidate_filter=True)
+
+    assert matches == expected == [(10.0, 0.25), (12.0, 0.61)]
+    assert sorted(all_inspected) == list(range(9))
+    assert inspected == [1, 2]
+
+
+wiki_page = """
+<html><head><title>AK-47 | Asiimov — CS.Money Wiki</title></head>
+<body><table>
+<tr><th>Factory New</th><th>Field-Tested</th><th><span>Battle-Scarred</span></th><th></th></tr>
+<tr><td>1</td></tr>
+</table><table><tr><th>Field-Tested</th></tr></table></body></html>
+"""
+
+
+async def parse_wiki_page(page: str, backend: str) -> dict:
+    url_constructor = SkinSteamUrl(weapon='AK-47', skin='Asiimov', quality='Field-Tested', stattrak=False)
+    in_queue, out_queue = ClosableQueue(), ClosableQueue()
+    await in_queue.put(page)
+    await in_queue.close()
+    await CSMWikiDataProvider(url_constructor, in_queue, out_queue, backend).get_processed_data()
+    return [data async for data in out_queue][0]
+
+
+@pytest.mark.asyncio
+async def test_wiki_backends_should_find_same_skin_data():
+    lxml_data = await parse_wiki_page(wiki_page, 'lxml')
+    bs4_data = await parse_wiki_page(wiki_page, 'bs4')
+    assert lxml_data['skin_name'] == bs4_data['skin_name'] == ('AK-47', 'Asiimov')
+    assert sorted(lxml_data['quality_data']) == sorted(bs4_data['quality_data']) == [
+        'Battle-Scarred', 'Factory New', 'Field-Tested'
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('page', ['<html><title>Not found</title><p>404</p></html>', ''])
+async def test_lxml_wiki_backend_should_raise_invalid_name(page):
+    with pytest.raises(InvalidName):
+        await parse_wiki_page(page, 'lxml')
+
+
+@pytest.mark.parametrize(
+    'price, result',
+    [('$2.68 USD', 2.68), ('2,68€', 2.68), ('1,234.56 USD', 1234.56), ('1.234,56€', 1234.56), ('¥ 1,234', 1234), ('--', None)]
+)
+def test_should_parse_steam_price_formats(price, result):
+    assert parse_steam_price(price) == result
@@ -0,0 +1,29 @@
+from telegram_bot.resources.proxy_pool import ProxyPool
+
+
+def test_should_prefer_faster_proxy():
+    pool = ProxyPool(['http://a', 'http://b'])
+    pool.release(pool.acquire(), 0.9, True)
+    pool.release(pool.acquire(), 0.1, True)
+    assert [pool.acquire() for _ in range(2)] == ['http://b', 'http://b']
+
+
+def test_should_cool_down_failing_proxy():
+    pool = ProxyPool(['http://a', 'http://b'], min_samples=2, cooldown=60)
+    for _ in range(2):
+        pool.release('http://a', 0.1, False)
+    pool.release('http://b', 0.5, True)
+    assert {pool.acquire() for _ in range(5)} == {'http://b'}
+    assert [stats.cooling_down for stats in pool.stats] == [True, False]
+
+
+def test_should_keep_sticky_session_on_same_proxy():
+    pool = ProxyPool(['http://a', 'http://b'])
+    first = pool.acquire('scan')
+    pool.release(first, 5.0, True)
+    assert pool.acquire('scan') == first
+    assert pool.acquire() != first
+
+
+def test_should_fall_back_to_direct_connection():
+    assert ProxyPool([]).acquire() is None
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+from aiohttp import web
+
+from telegram_bot.resources import parse_const
+from telegram_bot.resources.http_client import HttpClient
+from telegram_bot.resources.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_should_space_requests_after_burst():
+    limiter = AdaptiveRateLimiter(rate=20, burst=2)
+    started = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire('steamcommunity.com')
+    assert time.monotonic() - started >= 0.09
+
+
+def test_should_cut_rate_on_rate_limit_and_recover_slowly():
+    limiter = AdaptiveRateLimiter(rate=4, recovery_interval=0, increase=1, max_rate=5, rates={'cs.money': 8})
+    assert not limiter.report('steamcommunity.com', 200, parse_const.request_exception_str)
+    assert limiter.current_rate('steamcommunity.com') == 2
+    assert limiter.current_rate('cs.money') == 8
+
+    assert limiter.report('steamcommunity.com', 200, b'{"success": true}')
+    assert limiter.current_rate('steamcommunity.com') == 3
+    for _ in range(5):
+        limiter.success('steamcommunity.com')
+    assert limiter.current_rate('steamcommunity.com') == 5
+
+
+def test_should_cut_rate_once_per_burst_of_429():
+    limiter = AdaptiveRateLimiter(rate=1)
+    for _ in range(3):
+        limiter.report('steamcommunity.com', 429)
+    assert limiter.current_rate('steamcommunity.com') == 0.5
+
+
+class CountingRateLimiter(AdaptiveRateLimiter):
+    def __init__(self):
+        super().__init__(rate=1, burst=1)
+        self.acquired = []
+
+    async def acquire(self, host):
+        self.acquired.append(host)
+        await super().acquire(host)
+
+
+@pytest.mark.asyncio
+async def test_http_client_should_skip_rate_limit_when_asked():
+    async def handler(request):
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f'http://127.0.0.1:{runner.addresses[0][1]}/'
+
+    rate_limiter = CountingRateLimiter()
+    http_client = HttpClient(rate_limiter=rate_limiter)
+    try:
+        start = time.perf_counter()
+        for _ in range(5):
+            async with http_client.get(url, rate_limited=False) as response:
+                assert response.status == 200
+        assert time.perf_counter() - start < 1
+        async with http_client.get(url) as response:
+            assert response.status == 200
+        assert rate_limiter.acquired == ['127.0.0.1']
+    finally:
+        await http_client.close()
+        await runner.cleanup()
@@ -1,9 +1,18 @@
 import asyncio
+import random
+import threading
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
 
 import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
+from telegram_bot.csm.services import ResponseCSMDataService
+from telegram_bot.csm.url_constructors import SkinsCsmUrl
+from telegram_bot.commands.bot_errors_command import TechError
 from telegram_bot.tests.fixtures import queue
+from telegram_bot.steam import page_waits
+from telegram_bot.steam.browser_pool import BrowserPool
 from telegram_bot.steam.services import SeleniumSteamDataService, ApiSteamDataService
 from telegram_bot.steam.url_constructors import SkinSteamUrl, SkinSteamApiUrl
 
@@ -70,3 +79,153 @@ async def test_should_get_web_data_api_steam_service(queue):
     await service.add_web_data()
     async for web_data in service.queue:
         print(web_data)
+
+
+class FakeCsmResponse:
+    def __init__(self, data: dict):
+        self.data = data
+
+    async def json(self, content_type=None):
+        return self.data
+
+
+class FakeCsmHttpClient:
+    def __init__(self, last_offset: int):
+        self.last_offset = last_offset
+        self.offsets = []
+
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs):
+        offset = int(url.split('offset=')[1].split('&')[0])
+        self.offsets.append(offset)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        yield FakeCsmResponse({'error': 2} if offset > self.last_offset else {'items': [offset]})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('prefetch', [1, 4])
+async def test_should_get_csm_pages_in_offset_order(queue, prefetch):
+    url_const = SkinsCsmUrl(weapon='AK-47', skin='Asiimov', quality='Field-Tested', stattrak=False)
+    http_client = FakeCsmHttpClient(last_offset=540)
+    service = ResponseCSMDataService(url_const, queue, http_client, prefetch=prefetch)
+    await service.add_web_data()
+    assert [web_data['items'][0] async for web_data in queue] == list(range(0, 600, 60))
+    assert len(http_client.offsets) <= 10 + prefetch
+
+
+class FakeSteamRenderHttpClient:
+    def __init__(self, total_count: int):
+        self.total_count = total_count
+        self.starts = []
+
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs):
+        start = int(url.split('start=')[1].split('&')[0])
+        self.starts.append(start)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        yield FakeCsmResponse({
+            'total_count': self.total_count,
+            'start': start,
+            'listinginfo': {
+                str(start + index): {'converted_price_per_unit': start + index, 'converted_fee_per_unit': 0}
+                for index in range(min(100, self.total_count - start))
+            },
+        })
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('total_count, max_pages, expected_starts', [
+    (50, 10, [0]),
+    (750, 10, [0, 100, 200, 300, 400, 500, 600, 700]),
+    (5000, 3, [0, 100, 200]),
+])
+async def test_should_plan_steam_pages_from_total_count(queue, total_count, max_pages, expected_starts):
+    url_const = SkinSteamApiUrl(weapon='AK-47', skin='Asiimov', quality='Field-Tested', stattrak=False)
+    http_client = FakeSteamRenderHttpClient(total_count)
+    service = ApiSteamDataService(url_const, queue, http_client, max_pages=max_pages)
+    await service.add_web_data()
+    assert [web_data['start'] async for web_data in queue] == expected_starts
+    assert sorted(http_client.starts) == expected_starts
+
+
+@pytest.mark.asyncio
+async def test_should_stop_steam_scan_on_stop_condition(queue):
+    url_const = SkinSteamApiUrl(weapon='AK-47', skin='Asiimov', quality='Field-Tested', stattrak=False)
+    http_client = FakeSteamRenderHttpClient(5000)
+    service = ApiSteamDataService(
+        url_const, queue, http_client, max_pages=50, prefetch=2, stop_condition=lambda prices: max(prices) >= 2.5
+    )
+    await service.add_web_data()
+    assert [web_data['start'] async for web_data in queue] == [0, 100, 200]
+    assert len(http_client.starts) <= 5
+
+
+class FakeBrowserPool(BrowserPool):
+    def __init__(self):
+        super().__init__(size=1)
+        self.created = 0
+        self.quit = 0
+
+    async def _create_driver(self):
+        self.created += 1
+        return object()
+
+    @staticmethod
+    def _is_healthy(driver):
+        return True
+
+    async def _quit(self, driver):
+        self.quit += 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('error, quit', [(TimeoutException, 0), (WebDriverException, 1)])
+async def test_browser_pool_should_keep_driver_after_page_timeout(error, quit):
+    pool = FakeBrowserPool()
+    with pytest.raises(error):
+        async with pool.acquire():
+            raise error('page did not load')
+    async with pool.acquire():
+        pass
+    assert pool.quit == quit
+    assert pool.created == 1 + quit
+
+
+class FakeRecordsDriver:
+    def __init__(self, records):
+        self.records = records
+
+    def execute_script(self, script):
+        return self.records
+
+
+@pytest.mark.asyncio
+async def test_selenium_service_should_skip_incomplete_rows(queue):
+    url_const = SkinSteamUrl(weapon='AK-47', skin='Asiimov', quality='Field-Tested', stattrak=False)
+    service = SeleniumSteamDataService(url_const, queue)
+    service._driver = FakeRecordsDriver([
+        {'float': 0.25, 'seed': 1, 'price': '$2.68 USD', 'href': 'link_0'},
+        {'float': None, 'seed': None, 'price': '2,70€', 'href': 'link_1'},
+        {'float': 0.3, 'seed': 2, 'price': '$2.90 USD', 'href': None},
+    ])
+    assert await service._service_worker() == [2.68, 2.7, 2.9]
+    await queue.close()
+    assert [web_data['url'] async for web_data in queue] == ['link_0']
+
+    service._driver = FakeRecordsDriver([{'float': None, 'seed': None, 'price': '$2.68 USD', 'href': 'link_0'}])
+    with pytest.raises(TechError):
+        await service._service_worker()
+
+
+@pytest.mark.asyncio
+async def test_page_waits_should_poll_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    polls = []
+
+    def condition(driver):
+        polls.append(threading.get_ident())
+        return len(polls) >= 3
+
+    assert await page_waits.wait_until(None, condition, timeout=1, poll=0.001)
+    assert await page_waits.wait_optional(None, lambda driver: False, timeout=0.01) is None
+    assert loop_thread not in polls